@@ -1,20 +1,7 @@
 #!/bin/bash
 
-# Script to find all Dart files still using Material Icons
-echo "=== Files still using Material Icons ==="
-echo ""
-
-# Find all .dart files with Icons. usage (excluding LucideIcons)
-grep -r "Icons\." lib/ --include="*.dart" | grep -v "LucideIcons" | cut -d: -f1 | sort -u
-
-echo ""
-echo "=== Total count ==="
-grep -r "Icons\." lib/ --include="*.dart" | grep -v "LucideIcons" | cut -d: -f1 | sort -u | wc -l
-
-echo ""
-echo "=== Files still using elevation ==="
-grep -r "elevation:" lib/ --include="*.dart" | grep -v "elevation: 0" | cut -d: -f1 | sort -u
-
-echo ""
-echo "=== Files still using boxShadow ==="
-grep -r "boxShadow:" lib/ --include="*.dart" | cut -d: -f1 | sort -u
+# Report what is left of the Lucide migration under lib/: Material Icons,
+# non-zero elevation, boxShadow and invalid LucideIcons names.
+# All categories come from a single scan; pass --json for machine-readable
+# output or --fail-on-findings to gate CI on it.
+exec python3 "$(dirname "$0")/utils/audit.py" "$@"
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Migration audit: report what is left to migrate under lib/ in one scan.
+
+Every Dart file is read once and matched against a single combined pattern
+that covers all categories:
+
+- material_icon: leftover Material ``Icons.<name>`` references
+- elevation: ``elevation:`` arguments with a non-zero value
+- box_shadow: ``boxShadow:`` arguments
+- invalid_lucide: ``LucideIcons.<name>`` references that are not valid
+  Lucide names (including the ``LucideLucideIcons`` typo), checked against
+  the pinned lucide_icons source when it is in the pub cache (see
+  lucide_names.py) and by naming rules otherwise
+
+Use --json for machine-readable output with file:line:col locations, and
+--since <rev> or --staged to audit only the files changed in git.
+"""
+
+import argparse
+import json
+import re
+import sys
+from collections import Counter
+from functools import partial
+from pathlib import Path
+
+import fix_lucide_icons
+from codemod_runner import SourceFilter, add_walk_arguments
+from git_changes import GitError, add_changes_arguments, selected_dart_files
+from lucide_names import LucideNames
+
+CATEGORIES = ('material_icon', 'elevation', 'box_shadow', 'invalid_lucide')
+
+AUDIT_PATTERN = re.compile(r'''
+    \b(?P<lucide>(?:Lucide)+Icons)\.(?P<lucide_name>\w+)
+  | (?<![\w$])Icons\.(?P<material_name>\w+)
+  | \belevation\s*:\s*(?P<elevation>[^,)\n]+)
+  | \b(?P<box_shadow>boxShadow)\s*:
+''', re.VERBOSE)
+
+# Names fix_lucide_icons knows to be wrong
+KNOWN_INVALID_LUCIDE = frozenset(
+    old for old, new in fix_lucide_icons.ICON_MAPPINGS.items() if old != new
+)
+
+def is_valid_lucide_name(name, names=None):
+    """
+    Check a LucideIcons identifier.
+
+    With a LucideNames index this is exact; without one, Lucide identifiers
+    are lowerCamelCase and underscores mean a bad rewrite.
+    """
+    if names is not None:
+        return name in names
+    return '_' not in name and name not in KNOWN_INVALID_LUCIDE
+
+def is_zero(value):
+    """True for literal zero elevation values such as 0 or 0.0."""
+    try:
+        return float(value.strip()) == 0
+    except ValueError:
+        return False
+
+def audit_content(content, path, lucide_validator=is_valid_lucide_name):
+    """Yield findings for one file's content as dicts."""
+    line = 1
+    line_start = 0
+    scanned = 0
+
+    for match in AUDIT_PATTERN.finditer(content):
+        if match.group('lucide_name') is not None:
+            name = match.group('lucide_name')
+            if match.group('lucide') == 'LucideIcons' and lucide_validator(name):
+                continue
+            category = 'invalid_lucide'
+            token = f"{match.group('lucide')}.{name}"
+        elif match.group('material_name') is not None:
+            category = 'material_icon'
+            token = f"Icons.{match.group('material_name')}"
+        elif match.group('elevation') is not None:
+            value = match.group('elevation').strip()
+            if is_zero(value):
+                continue
+            category = 'elevation'
+            token = f"elevation: {value}"
+        else:
+            category = 'box_shadow'
+            token = 'boxShadow'
+
+        start = match.start()
+        newlines = content.count('\n', scanned, start)
+        if newlines:
+            line += newlines
+            line_start = content.rfind('\n', scanned, start) + 1
+        scanned = start
+
+        column = start - line_start + 1
+        yield {
+            'category': category,
+            'token': token,
+            'file': str(path),
+            'line': line,
+            'col': column,
+            'location': f"{path}:{line}:{column}",
+        }
+
+def audit_paths(paths, lucide_validator=is_valid_lucide_name):
+    """Audit every path; returns (files scanned, findings)."""
+    findings = []
+    file_count = 0
+    for path in paths:
+        file_count += 1
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                content = f.read()
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"Error reading {path}: {e}", file=sys.stderr)
+            continue
+        findings.extend(audit_content(content, path, lucide_validator))
+    return file_count, findings
+
+def build_report(file_count, findings):
+    """Summarise findings into a JSON-serialisable report."""
+    by_category = Counter(finding['category'] for finding in findings)
+    files = {category: set() for category in CATEGORIES}
+    for finding in findings:
+        files[finding['category']].add(finding['file'])
+
+    return {
+        'files_scanned': file_count,
+        'summary': {
+            category: {
+                'occurrences': by_category.get(category, 0),
+                'files': len(files[category]),
+            }
+            for category in CATEGORIES
+        },
+        'material_icons': dict(Counter(
+            finding['token'] for finding in findings
+            if finding['category'] == 'material_icon'
+        ).most_common()),
+        'findings': findings,
+    }
+
+def print_text_report(report):
+    """Human-readable report in the layout of the old check_remaining.sh."""
+    findings = report['findings']
+
+    def files_for(category):
+        return sorted({f['file'] for f in findings if f['category'] == category})
+
+    print("=== Files still using Material Icons ===")
+    print("")
+    for path in files_for('material_icon'):
+        print(path)
+    print("")
+    print("=== Total count ===")
+    print(report['summary']['material_icon']['files'])
+    print("")
+    print("=== Files still using elevation ===")
+    for path in files_for('elevation'):
+        print(path)
+    print("")
+    print("=== Files still using boxShadow ===")
+    for path in files_for('box_shadow'):
+        print(path)
+    print("")
+    print("=== Invalid LucideIcons names ===")
+    for finding in findings:
+        if finding['category'] == 'invalid_lucide':
+            suggestions = finding.get('suggestions')
+            hint = f"  (did you mean {', '.join(suggestions)}?)" if suggestions else ""
+            print(f"{finding['location']}: {finding['token']}{hint}")
+
+def main():
+    """Run the audit over lib/ (or the given directory)."""
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('lib_dir', nargs='?', default='lib',
+                        help='directory to scan (default: lib)')
+    parser.add_argument('--json', action='store_true',
+                        help='print the report as JSON')
+    parser.add_argument('--fail-on-findings', action='store_true',
+                        help='exit with status 1 if anything is left to migrate')
+    add_changes_arguments(parser)
+    add_walk_arguments(parser)
+    args = parser.parse_args()
+
+    source_filter = SourceFilter.from_args(args)
+    try:
+        paths = selected_dart_files(args, Path(args.lib_dir), source_filter)
+    except GitError as e:
+        parser.error(f"cannot list changed files: {e}")
+
+    names = LucideNames.load(Path(args.lib_dir).resolve().parent)
+    file_count, findings = audit_paths(paths,
+                                       partial(is_valid_lucide_name, names=names))
+    if names is not None:
+        for finding in findings:
+            if finding['category'] == 'invalid_lucide':
+                finding['suggestions'] = names.suggest(finding['token'].rsplit('.', 1)[-1])
+    report = build_report(file_count, findings)
+    report['skipped'] = {
+        'generated_files': source_filter.generated_files,
+        'excluded_files': source_filter.excluded_files,
+        'oversized_files': source_filter.oversized_files,
+        'bytes': source_filter.skipped_bytes,
+    }
+
+    if args.json:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        print_text_report(report)
+        print("")
+        print(f"({source_filter.summary()})")
+
+    if args.fail_on_findings and findings:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Benchmark the codemod transforms on a synthetic Dart corpus.
+
+The corpus generator writes widget files modelled on lib/: an import header,
+StatelessWidget classes with nested Container/Column/Row trees, Material
+``Icons.*`` usage, ``const Icon(...)`` expressions and nested
+``boxShadow: [BoxShadow(...)]`` decorations. Each transform is then timed on
+its own and reported as files/sec, MB/sec and peak traced memory.
+
+Examples:
+    python3 utils/benchmark.py --files 1000 --size medium
+    python3 utils/benchmark.py --files 50000 --size small --json report.json
+"""
+
+import argparse
+import json
+import random
+import re
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import cleanup_remaining
+import final_cleanup
+import fix_lucide_icons
+import migrate
+import replace_icons
+from codemod_runner import iter_dart_files
+
+# Widgets per generated file
+TREE_SIZES = {
+    'small': 4,
+    'medium': 30,
+    'large': 200,
+    'huge': 1500,
+}
+
+IMPORT_HEADER = """import 'package:flutter/material.dart';
+import 'package:flutter_bloc/flutter_bloc.dart';
+import 'package:rentverse/common/colors/custom_color.dart';
+import 'package:rentverse/common/widget/custom_app_bar.dart';
+"""
+
+def material_icon_names():
+    """Concrete Icons.<name> spellings the rule tables are written for."""
+    names = set()
+    for table in (replace_icons.ICON_MAPPINGS, cleanup_remaining.REMAINING_ICON_MAPPINGS):
+        for pattern in table:
+            body = pattern[len(r'Icons\.'):]
+            base = re.sub(r'\(.*', '', body)
+            names.add(base)
+            for group in re.findall(r'\((\w+)\)\?', body):
+                names.add(base + group)
+    # A few names no rule covers, as found in real trees
+    names.update(['tune', 'pool', 'kitchen', 'chair_alt', 'arrow_drop_down'])
+    return sorted(names)
+
+def _widget(rng, icons, depth=0):
+    """One widget subtree as Dart source lines."""
+    icon = rng.choice(icons)
+    indent = '  ' * (depth + 3)
+    kind = rng.random()
+    if kind < 0.35:
+        return [
+            f"{indent}Container(",
+            f"{indent}  padding: const EdgeInsets.all({rng.randint(4, 24)}),",
+            f"{indent}  decoration: BoxDecoration(",
+            f"{indent}    color: Colors.white,",
+            f"{indent}    borderRadius: BorderRadius.circular({rng.randint(4, 16)}),",
+            f"{indent}    boxShadow: [",
+            f"{indent}      BoxShadow(",
+            f"{indent}        color: Colors.black.withOpacity(0.{rng.randint(1, 9)}),",
+            f"{indent}        blurRadius: {rng.randint(2, 12)},",
+            f"{indent}        offset: const Offset(0, {rng.randint(1, 6)}),",
+            f"{indent}      ),",
+            f"{indent}    ],",
+            f"{indent}  ),",
+            f"{indent}  child: Icon(Icons.{icon}, size: {rng.randint(14, 32)}),",
+            f"{indent}),",
+        ]
+    if kind < 0.6:
+        return [
+            f"{indent}const Icon(Icons.{icon}, color: Colors.grey),",
+        ]
+    if kind < 0.8:
+        return [
+            f"{indent}ListTile(",
+            f"{indent}  leading: Icon(Icons.{icon}),",
+            f"{indent}  title: Text('{icon.replace('_', ' ')} ${{item.label}}'),",
+            f"{indent}  trailing: const Icon(Icons.chevron_right),",
+            f"{indent}),",
+        ]
+    return [
+        f"{indent}Card(",
+        f"{indent}  elevation: {rng.choice([0, 2, 4])},",
+        f"{indent}  child: Row(children: [",
+        f"{indent}    GradientIcon(icon: Icons.{icon}),",
+        f"{indent}    // Icons.{icon} in a comment",
+        f"{indent}    const SizedBox(width: 8),",
+        f"{indent}  ]),",
+        f"{indent}),",
+    ]
+
+def generate_file(rng, icons, index, widgets):
+    """Source of one synthetic widget file."""
+    lines = [IMPORT_HEADER, f"class GeneratedWidget{index} extends StatelessWidget {{",
+             f"  const GeneratedWidget{index}({{super.key}});", "",
+             "  @override", "  Widget build(BuildContext context) {",
+             "    return Column(", "      children: ["]
+    for _ in range(widgets):
+        lines.extend(_widget(rng, icons))
+    lines.extend(["      ],", "    );", "  }", "}", ""])
+    return '\n'.join(lines)
+
+def generate_corpus(out_dir, file_count, size='medium', seed=0):
+    """Write file_count synthetic Dart files under out_dir/lib; returns total bytes."""
+    rng = random.Random(seed)
+    icons = material_icon_names()
+    widgets = TREE_SIZES[size]
+    lib_dir = Path(out_dir) / 'lib'
+    total = 0
+    for index in range(file_count):
+        folder = lib_dir / f"feature_{index // 100:04d}"
+        if index % 100 == 0:
+            folder.mkdir(parents=True, exist_ok=True)
+        # Spread tree sizes around the target like a real project
+        count = max(1, int(widgets * rng.uniform(0.25, 1.75)))
+        content = generate_file(rng, icons, index, count)
+        path = folder / f"widget_{index:06d}.dart"
+        path.write_text(content, encoding='utf-8')
+        total += len(content.encode('utf-8'))
+    return total
+
+def content_benchmarks():
+    """Pure content transforms, as (name, function(content))."""
+    return [
+        ('replace_icons', lambda content: replace_icons.replace_icons(content)),
+        ('remove_box_shadows', replace_icons.remove_box_shadows),
+        ('add_lucide_import', replace_icons.add_lucide_import),
+        ('cleanup_remaining.cleanup_content', cleanup_remaining.cleanup_content),
+        ('fix_lucide_icons.fix_content', fix_lucide_icons.fix_content),
+        ('final_cleanup.apply_fixes',
+         lambda content: final_cleanup.apply_fixes(content, final_cleanup.FINAL_FIXES)),
+        ('migrate pipeline', lambda content: migrate.PIPELINE.run('lib/bench.dart', content)),
+        ('migrate pipeline (legacy)',
+         lambda content: migrate.PIPELINES['legacy'].run('lib/bench.dart', content)),
+    ]
+
+def _measure(paths, func):
+    """Time func over every file; returns (seconds, files, bytes)."""
+    elapsed = 0.0
+    size = 0
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        size += len(content.encode('utf-8'))
+        start = time.perf_counter()
+        func(content)
+        elapsed += time.perf_counter() - start
+    return elapsed, len(paths), size
+
+def _peak_memory(paths, func):
+    """Largest traced memory peak of func on a single file, in bytes."""
+    peak = 0
+    tracemalloc.start()
+    try:
+        for path in paths:
+            with open(path, 'r', encoding='utf-8') as f:
+                content = f.read()
+            tracemalloc.reset_peak()
+            baseline, _ = tracemalloc.get_traced_memory()
+            func(content)
+            _, file_peak = tracemalloc.get_traced_memory()
+            peak = max(peak, file_peak - baseline)
+    finally:
+        tracemalloc.stop()
+    return peak
+
+def _result(name, elapsed, files, size, peak):
+    elapsed = max(elapsed, 1e-9)
+    return {
+        'name': name,
+        'seconds': round(elapsed, 4),
+        'files': files,
+        'bytes': size,
+        'files_per_sec': round(files / elapsed, 1),
+        'mb_per_sec': round(size / elapsed / 1e6, 2),
+        'peak_memory_bytes': peak,
+    }
+
+def run_benchmarks(corpus_dir, memory=True, only=None):
+    """Run every benchmark against the corpus in corpus_dir."""
+    paths = list(iter_dart_files(Path(corpus_dir) / 'lib'))
+    results = []
+
+    for name, func in content_benchmarks():
+        if only and name not in only:
+            continue
+        elapsed, files, size = _measure(paths, func)
+        peak = _peak_memory(paths, func) if memory else None
+        results.append(_result(name, elapsed, files, size, peak))
+        print(_format_row(results[-1]))
+
+    # fix_file rewrites in place, so it runs last and on its own copy
+    if not only or 'fix_lucide_icons.fix_file' in only:
+        copy_dir = Path(corpus_dir) / 'fix_file_copy'
+        shutil.copytree(Path(corpus_dir) / 'lib', copy_dir)
+        copies = list(iter_dart_files(copy_dir))
+        size = sum(path.stat().st_size for path in copies)
+        start = time.perf_counter()
+        for path in copies:
+            fix_lucide_icons.fix_file(path)
+        elapsed = time.perf_counter() - start
+        shutil.rmtree(copy_dir)
+        results.append(_result('fix_lucide_icons.fix_file', elapsed, len(copies), size, None))
+        print(_format_row(results[-1]))
+
+    return results
+
+def _format_row(result):
+    peak = result['peak_memory_bytes']
+    peak_text = f"{peak / 1e6:9.2f} MB" if peak is not None else "        n/a"
+    return (f"{result['name']:36s} {result['seconds']:9.3f}s "
+            f"{result['files_per_sec']:11.1f} files/s {result['mb_per_sec']:8.2f} MB/s {peak_text}")
+
+def main():
+    """Generate a corpus and benchmark the transforms against it."""
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--files', type=int, default=1000,
+                        help='number of files to generate (default: 1000)')
+    parser.add_argument('--size', choices=sorted(TREE_SIZES), default='medium',
+                        help='widget tree size per file (default: medium)')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='random seed for the generator (default: 0)')
+    parser.add_argument('--corpus', type=Path,
+                        help='generate into (or reuse) this directory and keep it')
+    parser.add_argument('--only', action='append',
+                        help='run only the named benchmark (repeatable)')
+    parser.add_argument('--no-memory', dest='memory', action='store_false',
+                        help='skip the tracemalloc peak-memory pass')
+    parser.add_argument('--json', type=Path, metavar='PATH',
+                        help='also write the results as JSON to PATH')
+    args = parser.parse_args()
+
+    corpus_dir = args.corpus or Path(tempfile.mkdtemp(prefix='codemod-bench-'))
+    try:
+        if not (corpus_dir / 'lib').exists():
+            start = time.perf_counter()
+            total = generate_corpus(corpus_dir, args.files, args.size, args.seed)
+            print(f"Generated {args.files} files ({total / 1e6:.1f} MB) in "
+                  f"{time.perf_counter() - start:.1f}s under {corpus_dir}", file=sys.stderr)
+
+        results = run_benchmarks(corpus_dir, args.memory, args.only)
+    finally:
+        if args.corpus is None:
+            shutil.rmtree(corpus_dir, ignore_errors=True)
+
+    if args.json:
+        report = {'files': args.files, 'size': args.size, 'seed': args.seed, 'results': results}
+        args.json.write_text(json.dumps(report, indent=2), encoding='utf-8')
+
+if __name__ == '__main__':
+    main()
@@ -3,185 +3,184 @@
 Second pass - handle remaining edge cases and boxShadows more aggressively.
 """
 
+import argparse
 import re
-import os
-from pathlib import Path
-
-def remove_box_shadows_aggressive(content):
-    """Remove boxShadow properties more aggressively."""
-    # Pattern 1: Multi-line boxShadow
-    pattern1 = r',?\s*boxShadow:\s*\[[\s\S]*?\]'
-    content = re.sub(pattern1, '', content)
-    
-    # Pattern 2: Single line boxShadow
-    pattern2 = r',?\s*boxShadow:\s*const\s*\[[\s\S]*?\]'
-    content = re.sub(pattern2, '', content)
-    
-    # Pattern 3: BoxShadow with specific patterns
-    pattern3 = r',?\s*boxShadow:\s*\[\s*BoxShadow\([^]]+\)\s*\]'
-    content = re.sub(pattern3, '', content)
-    
-    # Clean up double commas
-    content = re.sub(r',\s*,', ',', content)
-    
-    # Clean up trailing commas before closing braces/brackets
-    content = re.sub(r',\s*\)', ')', content)
-    content = re.sub(r',\s*\]', ']', content)
-    
-    return content
 
-def replace_remaining_icons(content):
-    """Replace any remaining Material Icons patterns."""
-    replacements = {
-        r'Icons\.settings': 'LucideIcons.settings',
-        r'Icons\.logout': 'LucideIcons.logOut',
-        r'Icons\.verified': 'LucideIcons.badgeCheck',
-        r'Icons\.star(_border)?(_outline)?': 'LucideIcons.star',
-        r'Icons\.favorite(_border)?': 'LucideIcons.heart',
-        r'Icons\.share': 'LucideIcons.share2',
-        r'Icons\.bookmark(_border)?': 'LucideIcons.bookmark',
-        r'Icons\.refresh': 'LucideIcons.refreshCw',
-        r'Icons\.sync': 'LucideIcons.refreshCw',
-        r'Icons\.help(_outline)?': 'LucideIcons.helpCircle',
-        r'Icons\.question_mark': 'LucideIcons.helpCircle',
-        r'Icons\.expand_more': 'LucideIcons.chevronDown',
-        r'Icons\.expand_less': 'LucideIcons.chevronUp',
-        r'Icons\.chevron_right': 'LucideIcons.chevronRight',
-        r'Icons\.chevron_left': 'LucideIcons.chevronLeft',
-        r'Icons\.keyboard_arrow_down': 'LucideIcons.chevronDown',
-        r'Icons\.keyboard_arrow_up': 'LucideIcons.chevronUp',
-        r'Icons\.keyboard_arrow_right': 'LucideIcons.chevronRight',
-        r'Icons\.keyboard_arrow_left': 'LucideIcons.chevronLeft',
-        r'Icons\.done': 'LucideIcons.check',
-        r'Icons\.clear': 'LucideIcons.x',
-        r'Icons\.block': 'LucideIcons.ban',
-        r'Icons\.flag': 'LucideIcons.flag',
-        r'Icons\.thumb_up': 'LucideIcons.thumbsUp',
-        r'Icons\.thumb_down': 'LucideIcons.thumbsDown',
-        r'Icons\.visibility_outlined': 'LucideIcons.eye',
-        r'Icons\.comment': 'LucideIcons.messageSquare',
-        r'Icons\.reply': 'LucideIcons.reply',
-        r'Icons\.forward': 'LucideIcons.forward',
-        r'Icons\.save': 'LucideIcons.save',
-        r'Icons\.print': 'LucideIcons.printer',
-        r'Icons\.copy': 'LucideIcons.copy',
-        r'Icons\.paste': 'LucideIcons.clipboard',
-        r'Icons\.cut': 'LucideIcons.scissors',
-        r'Icons\.undo': 'LucideIcons.undo',
-        r'Icons\.redo': 'LucideIcons.redo',
-        r'Icons\.zoom_in': 'LucideIcons.zoomIn',
-        r'Icons\.zoom_out': 'LucideIcons.zoomOut',
-        r'Icons\.fullscreen': 'LucideIcons.maximize',
-        r'Icons\.fullscreen_exit': 'LucideIcons.minimize',
-        r'Icons\.play_arrow': 'LucideIcons.play',
-        r'Icons\.pause': 'LucideIcons.pause',
-        r'Icons\.stop': 'LucideIcons.square',
-        r'Icons\.skip_next': 'LucideIcons.skipForward',
-        r'Icons\.skip_previous': 'LucideIcons.skipBack',
-        r'Icons\.volume_up': 'LucideIcons.volume2',
-        r'Icons\.volume_down': 'LucideIcons.volume1',
-        r'Icons\.volume_off': 'LucideIcons.volumeX',
-        r'Icons\.brightness_high': 'LucideIcons.sun',
-        r'Icons\.brightness_low': 'LucideIcons.moon',
-        r'Icons\.wifi': 'LucideIcons.wifi',
-        r'Icons\.bluetooth': 'LucideIcons.bluetooth',
-        r'Icons\.battery_full': 'LucideIcons.battery',
-        r'Icons\.signal_cellular_alt': 'LucideIcons.signal',
-    }
-    
-    modified = content
-    for pattern, replacement in replacements.items():
-        modified = re.sub(pattern, replacement, modified)
-    
+from codemod_runner import (SourceFilter, add_preview_arguments, add_walk_arguments,
+                            preview_files)
+from dart_imports import LUCIDE_IMPORT, add_import
+from dart_lexer import remove_named_argument
+from icon_rewriter import IconRewriter, matcher_source
+from rule_packs import load_pack
+from run_cache import RunCache, add_cache_argument, rules_fingerprint
+from token_index import TokenIndex, scan_tokens
+from write_back import WriteBack, atomic_write
+
+# rules/cleanup_remaining.json
+REMAINING_ICON_RULES = load_pack('cleanup_remaining').rules
+REMAINING_ICON_MAPPINGS = dict(REMAINING_ICON_RULES)
+
+# A file can only change if one of these is present (see prefilter.py)
+TRIGGERS = [matcher_source(REMAINING_ICON_MAPPINGS), re.escape('boxShadow')]
+
+# IconRewriter per dispatched subset of REMAINING_ICON_RULES, built on first use
+_REWRITERS = {}
+
+def files_to_process(index):
+    """
+    Map the files the second pass handles to the icon rules they need.
+
+    Each icon rule goes only to the files with a Material token it matches
+    from the start (``Icons\\.star`` is not sent to ``LucideIcons.star``);
+    files with a boxShadow argument come with the rules they need, if any.
+    """
+    dispatch = index.dispatch(REMAINING_ICON_RULES, anchored=True)
+    for path in index.files_matching([re.escape('boxShadow')]):
+        dispatch.setdefault(path, [])
+    return dict(sorted(dispatch.items()))
+
+def rules_for(content):
+    """The icon rules files_to_process() would dispatch to this content."""
+    tokens = scan_tokens(content.encode('utf-8'))
+    return [rule for rule in REMAINING_ICON_RULES
+            if any(re.match(rule[0], token) for token in tokens)]
+
+def remove_box_shadows_aggressive(content, fired=None):
+    """Remove boxShadow properties, including const and single-line lists."""
+    # The bracket-aware remover handles every boxShadow form and takes the
+    # separating comma with it, so no global comma cleanup is needed.
+    modified, count = remove_named_argument(content, 'boxShadow')
+    if fired is not None:
+        fired.extend(['remove boxShadow'] * count)
     return modified
 
+def replace_remaining_icons(content, fired=None, rules=None):
+    """
+    Replace any remaining Material Icons patterns.
+
+    rules limits the pass to a dispatched subset of REMAINING_ICON_RULES.
+    Returns the new content and (pattern, replacement, count) per rule fired.
+    """
+    key = tuple(REMAINING_ICON_RULES if rules is None else rules)
+    if not key:
+        return content, []
+    if key not in _REWRITERS:
+        _REWRITERS[key] = IconRewriter(dict(key))
+    rewriter = _REWRITERS[key]
+    modified, fired_rules = rewriter.rewrite(content)
+    if fired is not None:
+        for pattern, replacement, count in fired_rules:
+            fired.extend([f"{pattern} -> {replacement}"] * count)
+    return modified, fired_rules
+
 def add_lucide_import(content):
     """Add Lucide icons import if not present."""
-    if 'package:lucide_icons/lucide_icons.dart' in content:
-        return content
+    return add_import(content, LUCIDE_IMPORT)
+
+def cleanup_content(content, fired=None, rules=None):
+    """
+    Apply the second-pass boxShadow, icon and import rewrites to file content.
+    
+    rules are the icon rules dispatched to the file by files_to_process();
+    by default they are picked from the content's own tokens the same way.
+    If fired is a list, the label of a rule is appended to it for every
+    match that rule rewrote.
+    """
+    # Remove box shadows aggressively
+    content = remove_box_shadows_aggressive(content, fired)
     
-    # Find the last import statement
-    import_pattern = r"(import\s+['\"].*?['\"];)"
-    imports = list(re.finditer(import_pattern, content))
+    # Replace remaining icons
+    if rules is None:
+        rules = rules_for(content)
+    content, replacements = replace_remaining_icons(content, fired, rules)
     
-    if imports:
-        last_import = imports[-1]
-        insert_pos = last_import.end()
-        return (content[:insert_pos] + 
-                "\nimport 'package:lucide_icons/lucide_icons.dart';" +
-                content[insert_pos:])
+    # Add Lucide import if an icon was replaced
+    if replacements:
+        with_import = add_lucide_import(content)
+        if fired is not None and with_import != content:
+            fired.append('add lucide import')
+        content = with_import
     
     return content
 
-def process_file(file_path):
-    """Process a single Dart file."""
+def rewrite(path, content):
+    """Rewrite hook for --dry-run/--diff: returns (content, per-match rule labels)."""
+    fired = []
+    content = cleanup_content(content, fired)
+    return content, fired
+
+def process_file(file_path, rules=None, write=True):
+    """
+    Process a single Dart file; returns None if it could not be processed.
+
+    With write=False the new content is returned in place of True, for a
+    WriteBack (see write_back.py).
+    """
     try:
         with open(file_path, 'r', encoding='utf-8') as f:
             content = f.read()
         
         original_content = content
-        
-        # Remove box shadows aggressively
-        content = remove_box_shadows_aggressive(content)
-        
-        # Replace remaining icons
-        content = replace_remaining_icons(content)
-        
-        # Add Lucide import if needed
-        if 'Icons.' in content and 'LucideIcons' in content:
-            content = add_lucide_import(content)
+        content = cleanup_content(content, rules=rules)
         
         # Only write if changes were made
         if content != original_content:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            if not write:
+                return content
+            atomic_write(file_path, content)
             return True
         
         return False
     
     except Exception as e:
         print(f"Error processing {file_path}: {e}")
-        return False
+        return None
 
 def main():
     """Main function."""
-    # List of files that still need processing
-    files_to_process = [
-        'lib/features/auth/presentation/pages/profile_pages.dart',
-        'lib/features/auth/presentation/pages/trust_index_page.dart',
-        'lib/features/chat/presentation/pages/chat_list_page.dart',
-        'lib/features/chat/presentation/pages/chat_room_page_view.dart',
-        'lib/role/lanlord/widget/my_property/property_components.dart',
-        'lib/role/lanlord/widget/dashboard/property_being_proposed.dart',
-        'lib/role/lanlord/widget/dashboard/rented_property.dart',
-        'lib/role/lanlord/widget/dashboard/stats_widget.dart',
-        'lib/role/lanlord/widget/dashboard/your_trust_index.dart',
-        'lib/role/lanlord/presentation/pages/booking_detail.dart',
-        'lib/role/tenant/presentation/pages/nav/rent.dart',
-        'lib/role/tenant/presentation/pages/property/booking_property.dart',
-        'lib/role/tenant/presentation/pages/rent/detail_active_rent.dart',
-        'lib/role/tenant/presentation/pages/rent/midtrans_payment_page.dart',
-        'lib/role/tenant/presentation/pages/rent/receipt_booking.dart',
-        'lib/role/tenant/presentation/widget/detail_property/accessorise_widget.dart',
-        'lib/role/tenant/presentation/widget/detail_property/amenities_widget.dart',
-        'lib/role/tenant/presentation/widget/property/search_and_sort_widget_in_property.dart',
-        'lib/role/tenant/presentation/widget/review/review_widget.dart',
-        'lib/role/tenant/presentation/widget/midtrans/card_property.dart',
-        'lib/role/tenant/presentation/widget/property/list_property.dart',
-        'lib/role/tenant/presentation/widget/receipt_booking/nav_bar_receipt.dart',
-    ]
+    parser = argparse.ArgumentParser(description=__doc__)
+    add_cache_argument(parser)
+    add_preview_arguments(parser)
+    add_walk_arguments(parser)
+    args = parser.parse_args()
+    
+    source_filter = SourceFilter.from_args(args)
+    index = TokenIndex.for_root('.', args.use_cache).update('lib', source_filter)
+    index.save()
+    dispatch = files_to_process(index)
+    
+    if args.dry_run or args.diff:
+        preview_files(rewrite, list(dispatch), diff=args.diff)
+        return
+    
+    cache = RunCache.for_tool('.', 'cleanup_remaining',
+                              rules_fingerprint(REMAINING_ICON_MAPPINGS), args.use_cache)
     
     modified_count = 0
     
-    for file_path in files_to_process:
-        if os.path.exists(file_path):
-            if process_file(file_path):
-                modified_count += 1
-                print(f"✓ {file_path}")
-        else:
-            print(f"✗ File not found: {file_path}")
+    writer = WriteBack.for_root('.', on_written=cache.record)
+    try:
+        with writer:
+            for file_path, rules in dispatch.items():
+                if cache.is_current(file_path):
+                    continue
+                output = process_file(file_path, rules, write=False)
+                if output is None:
+                    continue
+                if output:
+                    writer.write(file_path, output)
+                    modified_count += 1
+                    print(f"✓ {file_path}")
+                else:
+                    cache.record(file_path)
+    finally:
+        cache.save()
     
-    print(f"\nModified {modified_count} files")
+    print(f"\nModified {modified_count} of {len(dispatch)} files with remaining tokens "
+          f"({cache.skipped} unchanged since last run, {index.summary()}; "
+          f"{source_filter.summary()})")
+    if writer.written:
+        print("Undo with python3 utils/write_back.py --rollback")
 
 if __name__ == '__main__':
     main()
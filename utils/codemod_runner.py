@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Shared driver for the codemod scripts: file discovery, the --jobs pool and
+the --dry-run/--diff preview mode.
+
+File discovery skips generated sources (build_runner, freezed,
+json_serializable output): files named like GENERATED_SUFFIXES, and files
+whose first SNIFF_BYTES bytes contain the ``GENERATED CODE - DO NOT MODIFY``
+banner. Those are regenerated anyway and are often the largest files in the
+tree. The name is checked first; the head is only read for files the run
+cache has not already cleared, so a warm run stays stat-only.
+--include/--exclude globs narrow the walk further, and --max-bytes skips
+oversized files.
+"""
+
+import difflib
+import os
+import sys
+from fnmatch import fnmatchcase
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+
+def add_jobs_argument(parser):
+    """Register the --jobs option on an argparse parser."""
+    parser.add_argument(
+        '-j', '--jobs',
+        type=int,
+        default=1,
+        metavar='N',
+        help='number of worker processes (0 = one per CPU, default: 1)',
+    )
+
+def resolve_jobs(jobs):
+    """Turn the --jobs value into a worker count."""
+    if jobs <= 0:
+        return os.cpu_count() or 1
+    return jobs
+
+GENERATED_SUFFIXES = ('.g.dart', '.freezed.dart')
+GENERATED_MARKER = b'GENERATED CODE - DO NOT MODIFY'
+SNIFF_BYTES = 512
+
+def add_walk_arguments(parser):
+    """Register the --include, --exclude and --include-generated options."""
+    parser.add_argument('--include', action='append', default=[], metavar='GLOB',
+                        help='only process files matching GLOB, relative to lib/ (repeatable)')
+    parser.add_argument('--exclude', action='append', default=[], metavar='GLOB',
+                        help='skip files matching GLOB, relative to lib/ (repeatable)')
+    parser.add_argument('--include-generated', dest='skip_generated', action='store_false',
+                        help='also process generated files (*.g.dart, *.freezed.dart, '
+                             'GENERATED CODE banner)')
+    parser.add_argument('--max-bytes', type=int, metavar='N',
+                        help='skip files larger than N bytes')
+
+def _size(path):
+    try:
+        return os.stat(path).st_size
+    except OSError:
+        return 0
+
+def is_generated(path, sniff=SNIFF_BYTES):
+    """
+    (generated, size) of a Dart file, judged by its name or its first bytes.
+
+    Only the head of the file is read.
+    """
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if str(path).endswith(GENERATED_SUFFIXES):
+            return True, size
+        return GENERATED_MARKER in f.read(sniff), size
+
+class SourceFilter:
+    """
+    Include/exclude globs, size limit and generated-file sniff of the shared walker.
+
+    ``cleared`` may be set to a predicate such as RunCache.is_unchanged:
+    files it accepts were already judged on an earlier run and are not
+    sniffed again.
+    """
+
+    def __init__(self, include=(), exclude=(), skip_generated=True, max_bytes=None):
+        self.include = list(include)
+        self.exclude = list(exclude)
+        self.skip_generated = skip_generated
+        self.max_bytes = max_bytes
+        self.cleared = None
+        self.generated_files = 0
+        self.excluded_files = 0
+        self.oversized_files = 0
+        self.skipped_bytes = 0
+
+    @classmethod
+    def from_args(cls, args):
+        """Filter for the options registered by add_walk_arguments."""
+        return cls(args.include, args.exclude, args.skip_generated, args.max_bytes)
+
+    def _matches(self, patterns, relative):
+        name = relative.rsplit('/', 1)[-1]
+        return any(fnmatchcase(relative, pattern) or fnmatchcase(name, pattern)
+                   for pattern in patterns)
+
+    def accepts(self, path, relative):
+        """True if the walk should yield path; counts what it skips."""
+        if ((self.include and not self._matches(self.include, relative))
+                or self._matches(self.exclude, relative)):
+            self.excluded_files += 1
+            self.skipped_bytes += _size(path)
+            return False
+
+        if self.skip_generated and relative.endswith(GENERATED_SUFFIXES):
+            self.generated_files += 1
+            self.skipped_bytes += _size(path)
+            return False
+
+        if self.max_bytes is not None:
+            size = _size(path)
+            if size > self.max_bytes:
+                self.oversized_files += 1
+                self.skipped_bytes += size
+                return False
+
+        if self.skip_generated and not (self.cleared is not None and self.cleared(path)):
+            try:
+                generated, size = is_generated(path)
+            except OSError:
+                return True
+            if generated:
+                self.generated_files += 1
+                self.skipped_bytes += size
+                return False
+        return True
+
+    def summary(self):
+        """One-line description of what the walk skipped."""
+        return (f"{self.generated_files} generated, {self.excluded_files} excluded and "
+                f"{self.oversized_files} oversized files ({self.skipped_bytes / 1e6:.2f} MB) "
+                f"skipped")
+
+def iter_dart_files(lib_dir, source_filter=None):
+    """
+    Yield .dart files under lib_dir in a stable order as the walk finds them.
+
+    Generated files are skipped unless source_filter says otherwise; pass
+    ``SourceFilter(skip_generated=False)`` to see every file.
+    """
+    source_filter = SourceFilter() if source_filter is None else source_filter
+    for root, dirs, files in os.walk(lib_dir):
+        dirs.sort()
+        prefix = os.path.relpath(root, lib_dir).replace(os.sep, '/')
+        prefix = '' if prefix == '.' else prefix + '/'
+        for name in sorted(files):
+            if name.endswith('.dart'):
+                path = Path(root) / name
+                if source_filter.accepts(path, prefix + name):
+                    yield path
+
+def map_files(func, paths, jobs=1):
+    """
+    Apply func to every path and yield (path, result) in input order.
+
+    With more than one job, paths are streamed to a process pool while the
+    walk is still running; at most a few tasks per worker are kept in flight
+    so results come back in the same order as serial mode.
+    """
+    jobs = resolve_jobs(jobs)
+    if jobs == 1:
+        for path in paths:
+            yield path, func(path)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        pending = deque()
+        for path in paths:
+            pending.append((path, executor.submit(func, path)))
+            if len(pending) >= jobs * 4:
+                done_path, future = pending.popleft()
+                yield done_path, future.result()
+        while pending:
+            done_path, future = pending.popleft()
+            yield done_path, future.result()
+
+def add_preview_arguments(parser):
+    """Register the --dry-run and --diff options on an argparse parser."""
+    parser.add_argument(
+        '--dry-run',
+        action='store_true',
+        help='report what would change without writing any file',
+    )
+    parser.add_argument(
+        '--diff',
+        action='store_true',
+        help='like --dry-run, and stream a unified diff per file to stdout',
+    )
+
+def unified_diff(path, original, updated):
+    """Unified diff between two versions of a file, as one string."""
+    label = Path(os.path.relpath(path)).as_posix()
+    lines = []
+    for line in difflib.unified_diff(original.splitlines(keepends=True),
+                                     updated.splitlines(keepends=True),
+                                     f'a/{label}', f'b/{label}'):
+        if not line.endswith('\n'):
+            line += '\n\\ No newline at end of file\n'
+        lines.append(line)
+    return ''.join(lines)
+
+def preview_file(path, rewrite, diff=False):
+    """
+    Run rewrite(path, content) on a file without writing it.
+
+    Returns (modified, fired rule labels, diff text or None).
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            original = f.read()
+        updated, fired = rewrite(path, original)
+    except Exception as e:
+        print(f"Error processing {path}: {e}", file=sys.stderr)
+        return False, [], None
+
+    if updated == original:
+        return False, [], None
+    return True, list(fired), unified_diff(path, original, updated) if diff else None
+
+def preview_files(rewrite, paths, jobs=1, diff=False):
+    """
+    Dry-run a codemod over paths and end with a per-rule summary.
+
+    Diffs are written to stdout as soon as each file is done, so only the
+    files in flight are ever held in memory. With --diff the progress lines
+    and the summary go to stderr to keep stdout a clean patch.
+    """
+    log = sys.stderr if diff else sys.stdout
+    rule_files = Counter()
+    file_count = 0
+    modified_count = 0
+
+    for path, (modified, fired, text) in map_files(
+            partial(preview_file, rewrite=rewrite, diff=diff), paths, jobs):
+        file_count += 1
+        if not modified:
+            continue
+        modified_count += 1
+        rule_files.update(set(fired))
+        if text:
+            sys.stdout.write(text)
+            sys.stdout.flush()
+        print(f"~ {os.path.relpath(path)}", file=log)
+
+    print("", file=log)
+    print("=== Rules that would fire (files) ===", file=log)
+    for rule, count in sorted(rule_files.items(), key=lambda item: (-item[1], item[0])):
+        print(f"{count:6d}  {rule}", file=log)
+    print("", file=log)
+    print(f"Would modify {modified_count} of {file_count} files (dry run, nothing written)",
+          file=log)
@@ -0,0 +1,497 @@
+#!/usr/bin/env python3
+"""
+Const restoration: put ``const`` back on widget expressions that can take it.
+
+fix_lucide_icons.py strips ``const`` from every ``Icon(LucideIcons.…)`` and
+``GradientIcon(icon: LucideIcons.…)``, but LucideIcons members are const
+IconData, so those widgets (and often their parents) are constant. Without
+``const`` Flutter allocates them on every build and cannot canonicalize them.
+
+The pass scans the token stream from dart_lexer.py, finds constructor calls
+whose arguments are all constant, and adds ``const`` to the outermost such
+expression, dropping the ``const`` keywords that become redundant inside it.
+A call is constant when its class has a const constructor (a Flutter one
+from CONST_CONSTRUCTORS or any the project itself creates or declares with
+``const``) and every argument is a literal, a LucideIcons/Colors/enum-style
+constant, a project top-level ``const`` or another constant call.
+
+Each hoisted expression saves one allocation per build for every
+constructor call inside it, which is the estimate reported per file.
+
+Examples:
+    python3 utils/const_restorer.py --dry-run
+    python3 utils/const_restorer.py --jobs 0
+"""
+
+import argparse
+import json
+import os
+import re
+from functools import partial
+from pathlib import Path
+
+from codemod_runner import (SourceFilter, add_jobs_argument, add_preview_arguments,
+                            add_walk_arguments, iter_dart_files, map_files, preview_files)
+from dart_lexer import CLOSE_BRACKETS, OPEN_BRACKETS, DartSyntaxError, code_tokens
+from run_cache import CACHE_DIR, RunCache, add_cache_argument, rules_fingerprint
+from write_back import WriteBack, atomic_write
+
+# Flutter/Dart classes and named constructors known to be const
+CONST_CONSTRUCTORS = frozenset([
+    'Align', 'Alignment', 'AlwaysScrollableScrollPhysics', 'AspectRatio', 'BorderRadius.all',
+    'BorderSide', 'BouncingScrollPhysics', 'BoxConstraints', 'BoxDecoration', 'Card',
+    'Center', 'Chip', 'CircularProgressIndicator', 'ClipRRect', 'Color', 'Column',
+    'Divider', 'Duration', 'EdgeInsets.all', 'EdgeInsets.fromLTRB', 'EdgeInsets.only',
+    'EdgeInsets.symmetric', 'Expanded', 'FittedBox', 'Flexible', 'Icon', 'InputDecoration',
+    'LinearGradient', 'LinearProgressIndicator', 'ListTile', 'NeverScrollableScrollPhysics',
+    'Offset', 'Opacity', 'OutlineInputBorder', 'Padding', 'Positioned', 'Radius.circular',
+    'RoundedRectangleBorder', 'Row', 'Size', 'Size.fromHeight', 'SizedBox',
+    'SizedBox.expand', 'SizedBox.shrink', 'SizedBox.square', 'Spacer', 'Stack', 'Text',
+    'TextStyle', 'Tooltip', 'VerticalDivider',
+])
+
+# Classes whose ``Class.member`` values are compile-time constants
+CONST_NAMESPACES = frozenset([
+    'Alignment', 'Axis', 'BorderRadius', 'BorderStyle', 'BoxFit', 'BoxShape', 'Brightness',
+    'Clip', 'Colors', 'CrossAxisAlignment', 'Curves', 'EdgeInsets', 'FlexFit', 'FontStyle',
+    'FontWeight', 'Icons', 'LucideIcons', 'MainAxisAlignment', 'MainAxisSize', 'StackFit',
+    'TextAlign', 'TextCapitalization', 'TextDecoration', 'TextInputAction', 'TextInputType',
+    'TextOverflow', 'VerticalDirection', 'WrapAlignment', 'double',
+])
+
+CONST_LITERALS = frozenset(['true', 'false', 'null'])
+
+NUMBER = re.compile(r'(?:\d+(?:\.\d+)?(?:[eE][+-]?\d+)?|0[xX][0-9A-Fa-f]+)')
+ARITHMETIC = frozenset('+-*/%')
+
+# Tokens after which a constructor call is in expression position
+EXPRESSION_START = frozenset(['(', '[', ',', ':', '=', '?', 'return', 'yield'])
+
+# Project declarations that extend the tables above
+PROJECT_CONST_CALL = re.compile(r'\bconst\s+([A-Z]\w*(?:\.[a-z]\w*)?)\s*\(')
+PROJECT_TOP_LEVEL_CONST = re.compile(r'^const\s+(?:[\w<>?, ]+\s+)?([a-z_$][\w$]*)\s*=',
+                                     re.MULTILINE)
+PROJECT_ENUM = re.compile(r'^enum\s+([A-Z]\w*)', re.MULTILINE)
+
+# Bump when the PROJECT_* patterns change
+TABLE_VERSION = 1
+
+# Every constructor in the tables is capitalized, so a file without a
+# capitalized call has nothing to restore (prefilter trigger)
+CONSTRUCTOR_CALL = r'\b[A-Z]\w*(?:\s*\.\s*\w+)?\s*\('
+
+class ConstTable:
+    """Const constructors, constant namespaces and top-level constants."""
+
+    def __init__(self, constructors=CONST_CONSTRUCTORS, namespaces=CONST_NAMESPACES,
+                 constants=()):
+        self.constructors = set(constructors)
+        self.namespaces = set(namespaces)
+        self.constants = set(constants)
+
+    @classmethod
+    def for_project(cls, lib_dir, cache_path=None):
+        """
+        Built-in tables plus what the Dart sources under lib_dir declare.
+
+        With a cache_path, the declarations of each file are saved there
+        with its size and mtime, and a later call only reads the files
+        whose size or mtime changed.
+        """
+        table = cls()
+        saved = _load_declarations(cache_path)
+        files = {}
+        # Generated code declares const constructors too
+        for path in iter_dart_files(lib_dir, SourceFilter(skip_generated=False)):
+            key = Path(os.path.relpath(path, lib_dir)).as_posix()
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entry = saved.get(key)
+            if (entry is None or entry['size'] != stat.st_size
+                    or entry['mtime_ns'] != stat.st_mtime_ns):
+                try:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        content = f.read()
+                except (OSError, UnicodeDecodeError):
+                    continue
+                entry = {
+                    'size': stat.st_size,
+                    'mtime_ns': stat.st_mtime_ns,
+                    'constructors': sorted(set(PROJECT_CONST_CALL.findall(content))),
+                    'constants': sorted(set(PROJECT_TOP_LEVEL_CONST.findall(content))),
+                    'enums': sorted(set(PROJECT_ENUM.findall(content))),
+                }
+            files[key] = entry
+            table.constructors.update(entry['constructors'])
+            table.constants.update(entry['constants'])
+            table.namespaces.update(entry['enums'])
+
+        if cache_path is not None and files != saved:
+            _save_declarations(cache_path, files)
+        return table
+
+    def fingerprint(self):
+        return rules_fingerprint([(name, True) for name in sorted(
+            self.constructors | self.namespaces | self.constants)])
+
+def _load_declarations(cache_path):
+    """Per-file declarations saved by ConstTable.for_project(), or {}."""
+    if cache_path is None:
+        return {}
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            saved = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if saved.get('version') != TABLE_VERSION:
+        return {}
+    return saved.get('files', {})
+
+def _save_declarations(cache_path, files):
+    # Parallel runs may save at once, so each writes its own temp file
+    cache_path = Path(cache_path)
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = cache_path.with_name(f'.{cache_path.name}.{os.getpid()}.tmp')
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump({'version': TABLE_VERSION, 'files': files}, f)
+    os.replace(temp_path, cache_path)
+
+def _match_brackets(tokens):
+    """Index of the matching bracket for every bracket token."""
+    matches = {}
+    stack = []
+    for index, token in enumerate(tokens):
+        if token.kind != 'punct':
+            continue
+        if token.text in OPEN_BRACKETS:
+            stack.append(index)
+        elif token.text in CLOSE_BRACKETS and stack:
+            opener = stack.pop()
+            matches[opener] = index
+            matches[index] = opener
+    return matches
+
+def _chain_end(tokens, index):
+    """Index after the ``a.b.c`` identifier chain starting at index."""
+    end = index + 1
+    while (end + 1 < len(tokens) and tokens[end].text == '.'
+           and tokens[end + 1].kind == 'ident'):
+        end += 2
+    return end
+
+class _Scan:
+    """Constant-ness of the expressions of one token stream."""
+
+    def __init__(self, tokens, table):
+        self.tokens = tokens
+        self.table = table
+        self.brackets = _match_brackets(tokens)
+        self.calls = {}
+        self._const_call = {}
+        self.in_const = self._const_contexts()
+        self._find_calls()
+
+    def _const_contexts(self):
+        """in_const[i] is True when token i is already in a const context."""
+        tokens = self.tokens
+        delta = [0] * (len(tokens) + 1)
+        for index, token in enumerate(tokens):
+            if token.kind != 'ident' or token.text != 'const':
+                continue
+            after = index + 1
+            if after < len(tokens) and tokens[after].kind == 'ident':
+                after = _chain_end(tokens, after)
+            if after < len(tokens) and tokens[after].text == '<':
+                depth = 0
+                while after < len(tokens):
+                    depth += {'<': 1, '>': -1}.get(tokens[after].text, 0)
+                    after += 1
+                    if depth == 0:
+                        break
+            if after < len(tokens) and after in self.brackets and tokens[after].text in '([{':
+                end = self.brackets[after]
+            else:
+                # const declaration: constant up to the ';' at this depth
+                end = index
+                depth = 0
+                while end < len(tokens):
+                    text = tokens[end].text
+                    if text in OPEN_BRACKETS:
+                        depth += 1
+                    elif text in CLOSE_BRACKETS:
+                        depth -= 1
+                        if depth < 0:
+                            break
+                    elif text == ';' and depth == 0:
+                        break
+                    end += 1
+                # An unfinished buffer can end before the ';'
+                end = min(end, len(tokens) - 1)
+            delta[index + 1] += 1
+            delta[end + 1] -= 1
+
+        in_const = []
+        level = 0
+        for index in range(len(tokens)):
+            level += delta[index]
+            in_const.append(level > 0)
+        return in_const
+
+    def _find_calls(self):
+        """Constructor calls of const classes: start index -> (open, close)."""
+        tokens = self.tokens
+        for index, token in enumerate(tokens):
+            if token.kind != 'ident' or (index and tokens[index - 1].text in ('.', '@')):
+                continue
+            end = _chain_end(tokens, index)
+            if end >= len(tokens) or tokens[end].text != '(' or end not in self.brackets:
+                continue
+            callee = ''.join(t.text for t in tokens[index:end])
+            if callee in self.table.constructors:
+                self.calls[index] = (end, self.brackets[end])
+
+    def is_const_call(self, index):
+        if index not in self._const_call:
+            open_index, close_index = self.calls[index]
+            self._const_call[index] = all(
+                self.is_const(start, end)
+                for start, end in self._split(open_index + 1, close_index)
+            )
+        return self._const_call[index]
+
+    def _split(self, start, end):
+        """Top-level comma-separated ranges of tokens[start:end]."""
+        ranges = []
+        part = start
+        index = start
+        while index < end:
+            text = self.tokens[index].text
+            if text in OPEN_BRACKETS and index in self.brackets:
+                index = self.brackets[index] + 1
+                continue
+            if text == ',':
+                ranges.append((part, index))
+                part = index + 1
+            index += 1
+        if part < end:
+            ranges.append((part, end))
+        return ranges
+
+    def is_const(self, start, end):
+        """True if tokens[start:end] is a constant expression (or argument)."""
+        tokens = self.tokens
+        if start >= end:
+            return False
+
+        # Named argument
+        if end - start > 2 and tokens[start].kind == 'ident' and tokens[start + 1].text == ':':
+            start += 2
+
+        first = tokens[start]
+        if first.kind == 'ident' and first.text == 'const':
+            return True
+
+        if all(token.kind == 'string' for token in tokens[start:end]):
+            return all(self._const_string(token.text) for token in tokens[start:end])
+
+        if all(token.kind == 'number' or token.text in ARITHMETIC or token.text in '()'
+               for token in tokens[start:end]):
+            return all(NUMBER.fullmatch(token.text) for token in tokens[start:end]
+                       if token.kind == 'number')
+
+        if first.text == '-':
+            return self.is_const(start + 1, end)
+
+        if first.kind == 'ident':
+            chain_end = _chain_end(tokens, start)
+            names = [token.text for token in tokens[start:chain_end:2]]
+            if chain_end == end:
+                if len(names) == 1:
+                    return names[0] in CONST_LITERALS or names[0] in self.table.constants
+                return len(names) == 2 and names[0] in self.table.namespaces
+            if (start in self.calls and self.calls[start][1] == end - 1):
+                return self.is_const_call(start)
+            return False
+
+        if first.text == '[' and self.brackets.get(start) == end - 1:
+            elements = self._split(start + 1, end - 1)
+            return all(
+                self.tokens[element_start].text not in ('if', 'for', '...')
+                and self.is_const(element_start, element_end)
+                for element_start, element_end in elements
+            )
+
+        if first.text == '(' and self.brackets.get(start) == end - 1:
+            return self.is_const(start + 1, end - 1)
+
+        return False
+
+    @staticmethod
+    def _const_string(text):
+        if text.startswith('r'):
+            return True
+        return re.search(r'(?<!\\)\$', text) is None
+
+    def in_expression_position(self, index):
+        if index == 0:
+            return False
+        previous = self.tokens[index - 1].text
+        if previous == '>':
+            return index > 1 and self.tokens[index - 2].text == '='
+        return previous in EXPRESSION_START
+
+def restore_const(content, table, fired=None):
+    """
+    Add ``const`` to the outermost constant constructor calls in content.
+
+    Returns (content, allocations saved per build). If fired is a list, one
+    ``restore const`` label is appended per hoisted expression.
+    """
+    if '(' not in content:
+        return content, 0
+    try:
+        tokens = code_tokens(content)
+    except DartSyntaxError:
+        return content, 0
+
+    scan = _Scan(tokens, table)
+    hoisted = []
+    covered_until = -1
+    for index in sorted(scan.calls):
+        close_index = scan.calls[index][1]
+        if index <= covered_until or scan.in_const[index]:
+            continue
+        if not scan.in_expression_position(index) or not scan.is_const_call(index):
+            continue
+        hoisted.append((index, close_index))
+        covered_until = close_index
+
+    if not hoisted:
+        return content, 0
+
+    inserts = []
+    removals = []
+    saved = 0
+    for start, end in hoisted:
+        inserts.append(tokens[start].start)
+        for index in range(start, end + 1):
+            token = tokens[index]
+            if index in scan.calls and not scan.in_const[index]:
+                saved += 1
+            if token.kind == 'ident' and token.text == 'const':
+                removal_end = token.end
+                while removal_end < len(content) and content[removal_end] in ' \t':
+                    removal_end += 1
+                removals.append((token.start, removal_end))
+
+    edits = sorted([(position, position, 'const ') for position in inserts]
+                   + [(start, end, '') for start, end in removals])
+    pieces = []
+    position = 0
+    for start, end, text in edits:
+        pieces.append(content[position:start])
+        pieces.append(text)
+        position = end
+    pieces.append(content[position:])
+
+    if fired is not None:
+        fired.extend(['restore const'] * len(hoisted))
+    return ''.join(pieces), saved
+
+_PROJECT_TABLE = None
+
+def project_table():
+    """
+    ConstTable of this project's lib/, built once per process.
+
+    Declarations are cached under .codemod_cache/, so a warm start only
+    stats the Dart files.
+    """
+    global _PROJECT_TABLE
+    if _PROJECT_TABLE is None:
+        project_root = Path(__file__).resolve().parent.parent
+        _PROJECT_TABLE = ConstTable.for_project(project_root / 'lib',
+                                                project_root / CACHE_DIR / 'const_table.json')
+    return _PROJECT_TABLE
+
+def rewrite(path, content):
+    """Rewrite hook for --dry-run/--diff: returns (content, per-match rule labels)."""
+    fired = []
+    content, _ = restore_const(content, project_table(), fired)
+    return content, fired
+
+def process_file(file_path, write=True):
+    """
+    Restore const in one file; returns allocations saved (0 if unchanged).
+
+    With write=False it returns (new content or None, allocations saved)
+    instead, for a WriteBack in the parent process (see write_back.py).
+    """
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        updated, saved = restore_const(content, project_table())
+        if updated != content:
+            if not write:
+                return updated, saved
+            atomic_write(file_path, updated)
+            return saved
+    except Exception as e:
+        print(f"Error processing {file_path}: {e}")
+        return None
+    return 0 if write else (None, 0)
+
+def main():
+    """Restore const across lib/."""
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_jobs_argument(parser)
+    add_cache_argument(parser)
+    add_preview_arguments(parser)
+    add_walk_arguments(parser)
+    args = parser.parse_args()
+
+    project_root = Path(__file__).resolve().parent.parent
+    lib_dir = project_root / 'lib'
+    source_filter = SourceFilter.from_args(args)
+
+    if args.dry_run or args.diff:
+        preview_files(rewrite, iter_dart_files(lib_dir, source_filter), args.jobs, args.diff)
+        return
+
+    cache = RunCache.for_tool(project_root, 'const_restorer',
+                              project_table().fingerprint(), args.use_cache)
+    source_filter.cleared = cache.is_unchanged
+    dart_files = (path for path in iter_dart_files(lib_dir, source_filter)
+                  if not cache.is_current(path))
+
+    modified_count = 0
+    total_saved = 0
+    writer = WriteBack.for_root(project_root, on_written=cache.record)
+    try:
+        with writer:
+            for dart_file, result in map_files(partial(process_file, write=False),
+                                               dart_files, args.jobs):
+                if result is None:
+                    continue
+                output, saved = result
+                if output:
+                    writer.write(dart_file, output)
+                    modified_count += 1
+                    total_saved += saved
+                    print(f"✓ {dart_file.relative_to(project_root)} "
+                          f"(~{saved} allocations saved per build)")
+                else:
+                    cache.record(dart_file)
+    finally:
+        cache.save()
+
+    print(f"\nModified {modified_count} files, ~{total_saved} allocations saved per build "
+          f"({cache.skipped} unchanged since last run, {source_filter.summary()})")
+    if writer.written:
+        print("Undo with python3 utils/write_back.py --rollback")
+
+if __name__ == '__main__':
+    main()
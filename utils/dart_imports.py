@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+"""
+Import-directive manager that only reads the header of a Dart file.
+
+Directives (``library``, ``import``, ``export``, ``part``/``part of``) must
+come before any declaration, so the header is parsed with the lazy
+dart_lexer.py token stream and the scan stops at the first token that does
+not belong to a directive or comment. Adding, removing, deduplicating or
+sorting imports costs time proportional to the header, not the file.
+
+Imports are sorted the way the ``directives_ordering`` lint expects:
+``dart:`` first, then ``package:``, then relative URIs, each group in
+alphabetical order and separated by a blank line.
+
+``package:flutter/material.dart`` is dropped only when nothing in the body
+can still come from it: every capitalized identifier must be a dart:core
+type, LucideIcons or declared in the file itself, no top-level function or
+constant it re-exports from foundation, widgets or dart:ui (``showDialog``,
+``kToolbarHeight``, ``listEquals``, ``compute``) may be used, and no
+annotation other than dart:core's (``@immutable`` comes from package:meta).
+Identifiers interpolated into strings count too.
+
+Examples:
+    python3 utils/dart_imports.py --dedupe --sort --dry-run
+    python3 utils/dart_imports.py --prune-material --diff
+"""
+
+import argparse
+import re
+from collections import namedtuple
+from functools import partial
+from pathlib import Path
+
+from codemod_runner import (SourceFilter, add_jobs_argument, add_preview_arguments,
+                            add_walk_arguments, iter_dart_files, map_files, preview_files)
+from dart_lexer import DartSyntaxError, interpolations, tokenize
+from write_back import WriteBack, atomic_write
+
+LUCIDE_IMPORT = 'package:lucide_icons/lucide_icons.dart'
+MATERIAL_IMPORT = 'package:flutter/material.dart'
+
+DIRECTIVE_KEYWORDS = frozenset(['library', 'import', 'export', 'part'])
+
+# Capitalized names the body may use without any import
+DART_CORE = frozenset([
+    'BigInt', 'Comparable', 'DateTime', 'Deprecated', 'Duration', 'Enum', 'Error',
+    'Exception', 'FormatException', 'Function', 'Future', 'Invocation', 'Iterable',
+    'Iterator', 'List', 'Map', 'MapEntry', 'Never', 'Null', 'Object', 'Pattern',
+    'Record', 'RegExp', 'Set', 'StackTrace', 'StateError', 'Stopwatch', 'Stream',
+    'String', 'StringBuffer', 'Symbol', 'Type', 'Uri', 'ArgumentError', 'RangeError',
+    'UnimplementedError', 'UnsupportedError', 'LucideIcons',
+])
+
+# Lower-case Material exports: show* helpers, k* constants, debug* hooks...
+MATERIAL_FUNCTION = re.compile(r'(?:show|k|debug)[A-Z]\w*')
+
+# ...and the other top-level functions and values material.dart re-exports
+# from foundation, scheduler, painting, widgets and dart:ui
+MATERIAL_FUNCTIONS = frozenset([
+    'binarySearch', 'clampDouble', 'compute', 'consolidateHttpClientResponseBytes',
+    'defaultTargetPlatform', 'describeEnum', 'describeIdentity', 'hashList', 'hashValues',
+    'lerpDouble', 'listEquals', 'mapEquals', 'mergeSort', 'objectRuntimeType',
+    'paintImage', 'precacheImage', 'precisionErrorTolerance', 'runApp', 'setEquals',
+    'shortHash', 'timeDilation',
+])
+
+# Annotations that need no import; any other lower-case one (@immutable,
+# @protected, @mustCallSuper) comes from package:meta through material.dart
+CORE_ANNOTATIONS = frozenset(['override', 'deprecated', 'pragma'])
+
+DECLARATION_KEYWORDS = frozenset(['class', 'enum', 'mixin', 'typedef', 'extension'])
+
+STRING_LITERAL = re.compile(r'r?(\'\'\'|"""|\'|")(.*)\1', re.DOTALL)
+
+PART_OF = re.compile(r'part\s+of\b')
+
+Directive = namedtuple('Directive', 'keyword uri text start end')
+Header = namedtuple('Header', 'directives end')
+
+def parse_header(source):
+    """
+    Directives at the top of source, and the offset where the header ends.
+
+    Tokens are pulled from the lexer only until the first declaration, so
+    the rest of the file is never scanned.
+    """
+    directives = []
+    end = 0
+    current = None
+    for token in tokenize(source):
+        if current is not None:
+            keyword, uri, start = current
+            if token.kind == 'string' and uri is None:
+                uri = STRING_LITERAL.fullmatch(token.text).group(2)
+            if token.text == ';':
+                directives.append(Directive(keyword, uri, source[start:token.end],
+                                            start, token.end))
+                end = token.end
+                current = None
+            else:
+                current = (keyword, uri, start)
+            continue
+
+        if token.kind == 'comment':
+            continue
+        if token.kind != 'ident' or token.text not in DIRECTIVE_KEYWORDS:
+            break
+        current = (token.text, None, token.start)
+    return Header(directives, end)
+
+def import_group(uri):
+    """Sort group of an import URI: dart:, package:, then relative."""
+    if uri.startswith('dart:'):
+        return 0
+    if uri.startswith('package:'):
+        return 1
+    return 2
+
+def _sort_key(uri):
+    return (import_group(uri), uri)
+
+def _imports(header):
+    return [directive for directive in header.directives if directive.keyword == 'import']
+
+def _line_span(source, start, end):
+    """Extend start..end to the directive's whole line(s) and line break."""
+    line_start = source.rfind('\n', 0, start) + 1
+    if source[line_start:start].strip():
+        line_start = start
+    line_end = source.find('\n', end)
+    if line_end == -1:
+        line_end = len(source)
+    elif not source[end:line_end].strip():
+        line_end += 1
+    else:
+        line_end = end
+    return line_start, line_end
+
+def has_import(source, uri, header=None):
+    """True if source imports uri."""
+    header = parse_header(source) if header is None else header
+    return any(directive.uri == uri for directive in _imports(header))
+
+def is_part_file(header):
+    """True if the header has a ``part of`` directive."""
+    return any(directive.keyword == 'part' and PART_OF.match(directive.text)
+               for directive in header.directives)
+
+def add_import(source, uri):
+    """
+    Add ``import '<uri>';`` unless source already imports it.
+
+    The new line goes after the last import of its group that sorts before
+    it (or before the group's first import); a new group is started next
+    to its neighbours. Files without imports get it after the library
+    directive, before any export or part, or at the top. A ``part of``
+    file can't have imports of its own and is returned unchanged.
+    """
+    header = parse_header(source)
+    imports = _imports(header)
+    if any(directive.uri == uri for directive in imports) or is_part_file(header):
+        return source
+
+    line = f"import '{uri}';"
+    if imports:
+        group = import_group(uri)
+        same_group = [directive for directive in imports if import_group(directive.uri) == group]
+        if same_group:
+            earlier = [directive for directive in same_group if directive.uri < uri]
+            if earlier:
+                return source[:earlier[-1].end] + '\n' + line + source[earlier[-1].end:]
+            first = same_group[0]
+            return source[:first.start] + line + '\n' + source[first.start:]
+
+        # First import of its group: separate it from the neighbouring group
+        earlier = [directive for directive in imports if import_group(directive.uri) < group]
+        if earlier:
+            return source[:earlier[-1].end] + '\n\n' + line + source[earlier[-1].end:]
+        first = imports[0]
+        return source[:first.start] + line + '\n\n' + source[first.start:]
+
+    library = [directive for directive in header.directives if directive.keyword == 'library']
+    if library:
+        position = library[-1].end
+        return source[:position] + '\n\n' + line + source[position:]
+    if header.directives:
+        # Only exports and parts are left, and imports go before them
+        position = header.directives[0].start
+        return source[:position] + line + '\n' + source[position:]
+    return line + '\n\n' + source
+
+def remove_import(source, uri):
+    """Remove every import of uri, with its line when nothing else is on it."""
+    header = parse_header(source)
+    spans = [_line_span(source, directive.start, directive.end)
+             for directive in _imports(header) if directive.uri == uri]
+    for start, end in reversed(spans):
+        source = source[:start] + source[end:]
+    if spans and spans[0][0] == 0:
+        # Don't leave the file starting with the blank line after the import
+        source = source.lstrip('\n')
+    return source
+
+def dedupe_imports(source):
+    """Drop repeated import directives, keeping the first of each."""
+    header = parse_header(source)
+    seen = set()
+    spans = []
+    for directive in _imports(header):
+        key = ' '.join(directive.text.replace('"', "'").split())
+        if key in seen:
+            spans.append(_line_span(source, directive.start, directive.end))
+        seen.add(key)
+    for start, end in reversed(spans):
+        source = source[:start] + source[end:]
+    return source
+
+def sort_imports(source):
+    """
+    Sort the import block into dart:, package: and relative groups.
+
+    Only a block with nothing but whitespace between its imports is sorted;
+    comments there could belong to a particular import, so such a block is
+    left alone.
+    """
+    header = parse_header(source)
+    imports = _imports(header)
+    if len(imports) < 2:
+        return source
+    for previous, directive in zip(imports, imports[1:]):
+        if source[previous.end:directive.start].strip():
+            return source
+
+    groups = {}
+    for directive in sorted(imports, key=lambda directive: _sort_key(directive.uri)):
+        groups.setdefault(import_group(directive.uri), []).append(directive.text)
+    block = '\n\n'.join('\n'.join(texts) for _, texts in sorted(groups.items()))
+    return source[:imports[0].start] + block + source[imports[-1].end:]
+
+def _code_tokens(source):
+    """Tokens of source without comments, with string interpolations expanded."""
+    for token in tokenize(source):
+        if token.kind == 'string':
+            for expression in interpolations(token.text):
+                yield from _code_tokens(expression)
+        elif token.kind != 'comment':
+            yield token
+
+def uses_material(source, header=None):
+    """False only if no identifier in the body can come from material.dart."""
+    header = parse_header(source) if header is None else header
+    try:
+        tokens = list(_code_tokens(source[header.end:]))
+    except DartSyntaxError:
+        return True
+
+    declared = {
+        token.text for previous, token in zip(tokens, tokens[1:])
+        if previous.text in DECLARATION_KEYWORDS
+    }
+    previous = None
+    for token in tokens:
+        name = token.text
+        if token.kind == 'ident':
+            if previous == '@' and name not in CORE_ANNOTATIONS and name not in declared:
+                return True
+            if name[:1].isupper():
+                if name not in DART_CORE and name not in declared:
+                    return True
+            elif name in MATERIAL_FUNCTIONS or MATERIAL_FUNCTION.fullmatch(name):
+                return True
+        previous = name
+    return False
+
+def prune_material_import(source):
+    """Remove package:flutter/material.dart if the body no longer needs it."""
+    header = parse_header(source)
+    if not has_import(source, MATERIAL_IMPORT, header) or uses_material(source, header):
+        return source
+    return remove_import(source, MATERIAL_IMPORT)
+
+def tidy(content, dedupe=False, sort=False, prune_material=False, fired=None):
+    """Apply the selected header edits; append one label per edit to fired."""
+    edits = [
+        (dedupe, 'dedupe imports', dedupe_imports),
+        (prune_material, 'remove material import', prune_material_import),
+        (sort, 'sort imports', sort_imports),
+    ]
+    for enabled, name, edit in edits:
+        if not enabled:
+            continue
+        updated = edit(content)
+        if fired is not None and updated != content:
+            fired.append(name)
+        content = updated
+    return content
+
+def rewrite(path, content, **options):
+    """Rewrite hook for --dry-run/--diff: returns (content, applied edits)."""
+    fired = []
+    content = tidy(content, fired=fired, **options)
+    return content, fired
+
+def process_file(file_path, write=True, **options):
+    """
+    Apply the header edits to one Dart file; returns True if it changed.
+
+    With write=False the new content is returned in place of True, for a
+    WriteBack in the parent process (see write_back.py).
+    """
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+
+        updated = tidy(content, **options)
+        if updated != content:
+            if not write:
+                return updated
+            atomic_write(file_path, updated)
+            return True
+        return False
+    except Exception as e:
+        print(f"Error processing {file_path}: {e}")
+        return False
+
+def main():
+    """Dedupe, sort or prune the imports of every file under lib/."""
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--dedupe', action='store_true', help='drop repeated imports')
+    parser.add_argument('--sort', action='store_true',
+                        help='sort imports into dart:, package: and relative groups')
+    parser.add_argument('--prune-material', action='store_true',
+                        help=f"remove {MATERIAL_IMPORT} where nothing uses it")
+    add_jobs_argument(parser)
+    add_preview_arguments(parser)
+    add_walk_arguments(parser)
+    args = parser.parse_args()
+
+    if not (args.dedupe or args.sort or args.prune_material):
+        parser.error('nothing to do: pass --dedupe, --sort and/or --prune-material')
+
+    options = {'dedupe': args.dedupe, 'sort': args.sort,
+               'prune_material': args.prune_material}
+    project_root = Path(__file__).resolve().parent.parent
+    lib_dir = project_root / 'lib'
+    source_filter = SourceFilter.from_args(args)
+
+    if args.dry_run or args.diff:
+        preview_files(partial(rewrite, **options), iter_dart_files(lib_dir, source_filter),
+                      args.jobs, args.diff)
+        return
+
+    modified_count = 0
+    with WriteBack.for_root(project_root) as writer:
+        for dart_file, output in map_files(partial(process_file, write=False, **options),
+                                           iter_dart_files(lib_dir, source_filter), args.jobs):
+            if output:
+                writer.write(dart_file, output)
+                modified_count += 1
+                print(f"✓ {dart_file.relative_to(project_root)}")
+
+    print(f"\nModified {modified_count} files ({source_filter.summary()})")
+    if writer.written:
+        print("Undo with python3 utils/write_back.py --rollback")
+
+if __name__ == '__main__':
+    main()
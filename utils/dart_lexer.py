@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+"""
+Lightweight Dart lexer for the codemod scripts.
+
+It only knows as much Dart as the rewrites need: comments (including nested
+block comments), string literals (raw, triple-quoted and with ``${...}``
+interpolation), identifiers, numbers and single-character punctuation.
+Strings and comments come out as single tokens, so brackets inside them never
+affect bracket depth. Everything runs in one linear pass over the source.
+"""
+
+import re
+from collections import namedtuple
+
+Token = namedtuple('Token', 'kind text start end')
+
+OPEN_BRACKETS = {'(': ')', '[': ']', '{': '}'}
+CLOSE_BRACKETS = {')': '(', ']': '[', '}': '{'}
+
+_TOKEN = re.compile(r'''
+    (?P<space>\s+)
+  | (?P<line_comment>//[^\n]*)
+  | (?P<block_comment>/\*)
+  | (?P<string>r?(?:\'\'\'|"""|'|"))
+  | (?P<ident>[A-Za-z_$][A-Za-z0-9_$]*)
+  | (?P<number>\d[\w.]*)
+  | (?P<punct>.)
+''', re.VERBOSE | re.DOTALL)
+
+_BLOCK_COMMENT_PART = re.compile(r'/\*|\*/')
+
+# Runs of string body characters that need no special handling
+_STRING_BODY = {
+    "'": re.compile(r"[^'\\$\n]+"),
+    '"': re.compile(r'[^"\\$\n]+'),
+    "'''": re.compile(r"[^'\\$]+"),
+    '"""': re.compile(r'[^"\\$]+'),
+}
+_RAW_STRING_END = {
+    "'": re.compile(r"'|\n"),
+    '"': re.compile(r'"|\n'),
+    "'''": re.compile(r"'''"),
+    '"""': re.compile(r'"""'),
+}
+
+# Escapes and interpolations inside a string literal
+_STRING_SPECIAL = re.compile(r'[\\$]')
+_SIMPLE_INTERPOLATION = re.compile(r'\$([A-Za-z_][A-Za-z0-9_]*)')
+
+class DartSyntaxError(ValueError):
+    """Raised when the source cannot be tokenized (e.g. unterminated string)."""
+
+def _skip_block_comment(source, pos):
+    """Return the end of the block comment opened at pos (nesting aware)."""
+    depth = 1
+    pos += 2
+    while depth:
+        match = _BLOCK_COMMENT_PART.search(source, pos)
+        if not match:
+            raise DartSyntaxError(f"Unterminated block comment at offset {pos}")
+        depth += 1 if match.group() == '/*' else -1
+        pos = match.end()
+    return pos
+
+def _skip_string(source, pos, opener):
+    """Return the end of the string literal whose opener starts at pos."""
+    raw = opener.startswith('r')
+    quote = opener.lstrip('r')
+    pos += len(opener)
+
+    if raw:
+        match = _RAW_STRING_END[quote].search(source, pos)
+        if not match or match.group() == '\n':
+            raise DartSyntaxError(f"Unterminated string at offset {pos}")
+        return match.end()
+
+    body = _STRING_BODY[quote]
+    length = len(source)
+    while pos < length:
+        match = body.match(source, pos)
+        if match:
+            pos = match.end()
+            if pos >= length:
+                break
+        char = source[pos]
+        if source.startswith(quote, pos):
+            return pos + len(quote)
+        if char == '\\':
+            pos += 2
+        elif char == '$':
+            if source.startswith('${', pos):
+                pos = _skip_interpolation(source, pos + 2)
+            else:
+                pos += 1
+        elif char == '\n':
+            raise DartSyntaxError(f"Unterminated string at offset {pos}")
+        else:
+            # A lone quote character inside a triple-quoted string
+            pos += 1
+    raise DartSyntaxError(f"Unterminated string at offset {pos}")
+
+def _skip_interpolation(source, pos):
+    """Return the position just after the ``}`` closing an interpolation."""
+    depth = 0
+    while True:
+        match = _TOKEN.match(source, pos)
+        if not match:
+            raise DartSyntaxError(f"Unterminated interpolation at offset {pos}")
+        kind = match.lastgroup
+        if kind == 'block_comment':
+            pos = _skip_block_comment(source, pos)
+            continue
+        if kind == 'string':
+            pos = _skip_string(source, pos, match.group())
+            continue
+        text = match.group()
+        if text == '{':
+            depth += 1
+        elif text == '}':
+            if depth == 0:
+                return match.end()
+            depth -= 1
+        pos = match.end()
+
+def interpolations(literal):
+    """
+    Source of every expression interpolated into a string literal token.
+
+    ``$name`` gives ``name`` and ``${expr}`` gives ``expr``; raw strings
+    have none.
+    """
+    if literal.startswith('r'):
+        return []
+    quote = literal[:3] if literal[:3] in ("'''", '"""') else literal[0]
+    end = len(literal) - len(quote)
+    expressions = []
+    match = _STRING_SPECIAL.search(literal, len(quote), end)
+    while match:
+        pos = match.start()
+        if match.group() == '\\':
+            pos += 2
+        elif literal.startswith('${', pos):
+            close = _skip_interpolation(literal, pos + 2)
+            expressions.append(literal[pos + 2:close - 1])
+            pos = close
+        else:
+            simple = _SIMPLE_INTERPOLATION.match(literal, pos)
+            if simple:
+                expressions.append(simple.group(1))
+                pos = simple.end()
+            else:
+                pos += 1
+        match = _STRING_SPECIAL.search(literal, pos, end)
+    return expressions
+
+def tokenize(source, start=0):
+    """Yield the significant tokens of source from start; whitespace is dropped."""
+    pos = start
+    length = len(source)
+    while pos < length:
+        match = _TOKEN.match(source, pos)
+        kind = match.lastgroup
+        if kind == 'space':
+            pos = match.end()
+            continue
+        if kind == 'block_comment':
+            end = _skip_block_comment(source, pos)
+            yield Token('comment', source[pos:end], pos, end)
+        elif kind == 'line_comment':
+            end = match.end()
+            yield Token('comment', match.group(), pos, end)
+        elif kind == 'string':
+            end = _skip_string(source, pos, match.group())
+            yield Token('string', source[pos:end], pos, end)
+        else:
+            end = match.end()
+            yield Token(kind, match.group(), pos, end)
+        pos = end
+
+def code_tokens(source):
+    """Tokens of source without comments."""
+    return [token for token in tokenize(source) if token.kind != 'comment']
+
+# Starts of what _blank_skipped() blanks: comments and strings (the ``r``
+# of a raw string is checked separately, which keeps the search fast)
+_SKIPPED = re.compile(r'''//[^\n]*|/\*|\'\'\'|"""|'|"''')
+_BRACKET = re.compile(r'[()\[\]{}]')
+_IDENT_CHAR = re.compile(r'[\w$]')
+
+# Tokens that can appear between the angle brackets of type arguments
+_TYPE_ARGUMENT_PUNCT = frozenset(',.?<>')
+
+def _type_arguments_end(tokens, index):
+    """
+    Index of the ``>`` closing type arguments opened by the ``<`` at index.
+
+    ``<`` only opens type arguments right after an identifier, and only if
+    a balanced ``>`` follows with nothing but names, dots, commas and ``?``
+    in between (``f<int, int>(1)``, ``Map<String, List<int>>``). Returns
+    None for a comparison such as ``a < b``.
+    """
+    if index == 0 or tokens[index - 1].kind != 'ident':
+        return None
+    depth = 0
+    for cursor in range(index, len(tokens)):
+        token = tokens[cursor]
+        if token.kind != 'ident' and token.text not in _TYPE_ARGUMENT_PUNCT:
+            return None
+        if token.text == '<':
+            depth += 1
+        elif token.text == '>':
+            depth -= 1
+            if depth == 0:
+                return cursor
+    return None
+
+def find_named_arguments(tokens, name):
+    """
+    Find ``name: value`` arguments in call argument lists.
+
+    Yields (name_index, value_end_index, terminator_index) token indices, where
+    the terminator is the ``,`` after the value or the closing bracket of the
+    argument list.
+    """
+    stack = []
+    index = 0
+    count = len(tokens)
+    while index < count:
+        token = tokens[index]
+        text = token.text
+
+        if token.kind == 'punct':
+            if text in OPEN_BRACKETS:
+                stack.append(text)
+            elif text in CLOSE_BRACKETS and stack:
+                stack.pop()
+            index += 1
+            continue
+
+        if (token.kind == 'ident' and text == name and stack and stack[-1] == '('
+                and index > 0 and tokens[index - 1].text in ('(', ',')
+                and index + 1 < count and tokens[index + 1].text == ':'):
+            depth = 0
+            cursor = index + 2
+            while cursor < count:
+                value_text = tokens[cursor].text
+                if tokens[cursor].kind == 'punct':
+                    if value_text == '<':
+                        # Commas between type arguments don't end the value
+                        end = _type_arguments_end(tokens, cursor)
+                        if end is not None:
+                            cursor = end
+                    elif value_text in OPEN_BRACKETS:
+                        depth += 1
+                    elif value_text in CLOSE_BRACKETS:
+                        if depth == 0:
+                            break
+                        depth -= 1
+                    elif value_text == ',' and depth == 0:
+                        break
+                cursor += 1
+            if cursor >= count or cursor == index + 2:
+                # Incomplete or empty value: leave it alone
+                index += 1
+                continue
+            yield index, cursor - 1, cursor
+            index = cursor
+            continue
+
+        index += 1
+
+def _line_start(source, pos):
+    """Start of pos's line if only whitespace precedes pos on it, else None."""
+    start = source.rfind('\n', 0, pos) + 1
+    return start if source[start:pos].strip() == '' else None
+
+def _line_end(source, pos):
+    """Position after pos's line break if only whitespace follows pos, else None."""
+    end = source.find('\n', pos)
+    if end == -1:
+        end = len(source)
+    elif source[pos:end].strip() == '':
+        return end + 1
+    return end if source[pos:end].strip() == '' else None
+
+def _argument_list(source, start):
+    """Code tokens of the bracketed list opened at start, up to its closer."""
+    tokens = []
+    depth = 0
+    for token in tokenize(source, start):
+        if token.kind == 'comment':
+            continue
+        tokens.append(token)
+        if token.kind == 'punct':
+            if token.text in OPEN_BRACKETS:
+                depth += 1
+            elif token.text in CLOSE_BRACKETS:
+                depth -= 1
+                if depth == 0:
+                    break
+    return tokens
+
+def _blank_skipped(source, end):
+    """
+    source with its comments and strings up to end replaced by spaces.
+
+    Offsets are kept, so brackets and identifiers in the result are code.
+    """
+    pieces = []
+    pos = 0
+    while True:
+        match = _SKIPPED.search(source, pos)
+        if not match or match.start() >= end:
+            break
+        start = match.start()
+        text = match.group()
+        if (text[0] in '\'"' and start and source[start - 1] == 'r'
+                and not (start > 1 and _IDENT_CHAR.match(source, start - 2))):
+            start -= 1
+            text = 'r' + text
+        if text == '/*':
+            stop = _skip_block_comment(source, start)
+        elif text.startswith('//'):
+            stop = match.end()
+        else:
+            stop = _skip_string(source, start, text)
+        pieces.append(source[pos:start])
+        pieces.append(' ' * (stop - start))
+        pos = stop
+    pieces.append(source[pos:])
+    return ''.join(pieces)
+
+def _enclosing_opener(code, pos):
+    """Offset of the innermost bracket open at pos in blanked code, or None."""
+    depth = 0
+    high = pos
+    window = 256
+    while high > 0:
+        low = max(0, high - window)
+        for match in reversed(list(_BRACKET.finditer(code, low, high))):
+            if match.group() in CLOSE_BRACKETS:
+                depth += 1
+            elif depth == 0:
+                return match.start()
+            else:
+                depth -= 1
+        high = low
+        window *= 2
+    return None
+
+def _enclosing_lists(source, name):
+    """
+    Yield the code tokens of each argument list a ``name`` occurrence is in.
+
+    Comments and strings are blanked up to the last occurrence with one
+    regex search each; from every occurrence outside them the innermost
+    open bracket is found by scanning back, and only that list is tokenized.
+    """
+    occurrences = [match.start() for match in
+                   re.finditer(rf'{re.escape(name)}(?![\w$])', source)
+                   if not (match.start() and _IDENT_CHAR.match(source, match.start() - 1))]
+    if not occurrences:
+        return
+    code = _blank_skipped(source, occurrences[-1])
+    pos = 0
+    for target in occurrences:
+        if target < pos or code[target] == ' ':
+            # In a string, a comment or a list already yielded
+            continue
+        opener = _enclosing_opener(code, target)
+        if opener is None or code[opener] != '(':
+            continue
+        tokens = _argument_list(source, opener)
+        pos = tokens[-1].end
+        yield tokens
+
+def _argument_span(source, code, name_index, value_end, terminator):
+    """Source span to delete for one ``name: value`` found in code."""
+    if code[terminator].text == ',':
+        start = code[name_index].start
+        end = code[terminator].end
+        line_start = _line_start(source, start)
+        line_end = _line_end(source, end)
+        if line_start is not None and line_end is not None:
+            # The argument has its own line(s): remove them entirely
+            return line_start, line_end
+        while end < len(source) and source[end] in ' \t':
+            end += 1
+        return start, end
+    if code[name_index - 1].text == ',':
+        # Last argument without a trailing comma: drop the comma before it
+        return code[name_index - 1].start, code[value_end].end
+    # Sole argument
+    return code[name_index].start, code[value_end].end
+
+def remove_named_argument(source, name, where=None):
+    """
+    Remove every ``name: value`` named argument from source in one pass.
+
+    The argument's separating comma goes with it, and so does its whole line
+    when nothing else is on it. If ``where`` is given it is called with the
+    value's source text and only arguments for which it returns True are
+    removed. Returns (new_source, removed_count).
+    """
+    if name not in source:
+        return source, 0
+
+    spans = []
+    seen = set()
+    for code in _enclosing_lists(source, name):
+        for name_index, value_end, terminator in find_named_arguments(code, name):
+            # A nested list yielded earlier is part of its parent list too
+            if code[name_index].start in seen:
+                continue
+            seen.add(code[name_index].start)
+            value = source[code[name_index + 2].start:code[value_end].end]
+            if where is not None and not where(value):
+                continue
+            spans.append(_argument_span(source, code, name_index, value_end, terminator))
+
+    spans.sort()
+    if not spans:
+        return source, 0
+
+    pieces = []
+    position = 0
+    for start, end in spans:
+        pieces.append(source[position:start])
+        position = end
+    pieces.append(source[position:])
+    return ''.join(pieces), len(spans)
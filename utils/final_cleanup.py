@@ -3,54 +3,83 @@
 Final cleanup - handle remaining edge cases with specific icon names.
 """
 
+import argparse
 import re
 
-def fix_file(filepath, replacements):
-    """Fix a single file with specific replacements."""
+from codemod_runner import (SourceFilter, add_preview_arguments, add_walk_arguments,
+                            preview_files)
+from rule_packs import load_pack
+from token_index import TokenIndex
+from write_back import WriteBack, atomic_write
+
+# Replacements for icons the earlier passes left behind; each one is only
+# applied to the files whose indexed tokens it matches (see token_index.py)
+FINAL_FIXES = load_pack('final_cleanup').rules
+
+def apply_fixes(content, replacements, fired=None):
+    """Apply a list of (pattern, replacement) pairs to file content."""
+    for pattern, replacement in replacements:
+        content, count = re.subn(pattern, replacement, content)
+        if fired is not None:
+            fired.extend([f"{pattern} -> {replacement}"] * count)
+    return content
+
+def rewrite(path, content):
+    """Rewrite hook for --dry-run/--diff: returns (content, per-match rule labels)."""
+    fired = []
+    content = apply_fixes(content, FINAL_FIXES, fired)
+    return content, fired
+
+def fix_file(filepath, replacements, write=True):
+    """
+    Fix a single file with specific replacements.
+
+    With write=False the new content is returned in place of True, for a
+    WriteBack (see write_back.py).
+    """
     try:
         with open(filepath, 'r', encoding='utf-8') as f:
             content = f.read()
-        
+
         original = content
-        for pattern, replacement in replacements:
-            content = re.sub(pattern, replacement, content)
-        
+        content = apply_fixes(content, replacements)
+
         if content != original:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(content)
+            if not write:
+                return content
+            atomic_write(filepath, content)
             return True
         return False
     except Exception as e:
         print(f"Error: {e}")
         return False
 
-# Fix accessorise_widget.dart
-if fix_file('lib/role/tenant/presentation/widget/detail_property/accessorise_widget.dart', [
-    (r'Icons\.chair_alt', 'LucideIcons.armchair'),
-]):
-    print("✓ accessorise_widget.dart")
-
-# Fix amenities_widget.dart
-if fix_file('lib/role/tenant/presentation/widget/detail_property/amenities_widget.dart', [
-    (r'Icons\.pool', 'LucideIcons.waves'),
-    (r'Icons\.ac_unit', 'LucideIcons.wind'),
-    (r'Icons\.park_outlined', 'LucideIcons.trees'),
-    (r'Icons\.kitchen', 'LucideIcons.chefHat'),
-]):
-    print("✓ amenities_widget.dart")
-
-# Fix search_and_sort_widget_in_property.dart
-if fix_file('lib/role/tenant/presentation/widget/property/search_and_sort_widget_in_property.dart', [
-    (r'Icons\.tune', 'LucideIcons.sliders'),
-    (r'LucideLucideIcons\.mapPin', 'LucideIcons.mapPin'),
-]):
-    print("✓ search_and_sort_widget_in_property.dart")
-
-# Fix booking_property.dart
-if fix_file('lib/role/tenant/presentation/pages/property/booking_property.dart', [
-    (r'Icons\.arrow_drop_down', 'LucideIcons.chevronDown'),
-    (r'LucideLucideIcons\.mapPin', 'LucideIcons.mapPin'),
-]):
-    print("✓ booking_property.dart")
-
-print("\nDone!")
+def main():
+    """Apply each entry of FINAL_FIXES to the files that contain its token."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    add_preview_arguments(parser)
+    add_walk_arguments(parser)
+    args = parser.parse_args()
+
+    source_filter = SourceFilter.from_args(args)
+    index = TokenIndex.for_root('.').update('lib', source_filter)
+    index.save()
+    dispatch = index.dispatch(FINAL_FIXES)
+
+    if args.dry_run or args.diff:
+        preview_files(rewrite, list(dispatch), diff=args.diff)
+        return
+
+    with WriteBack.for_root('.') as writer:
+        for filepath, replacements in dispatch.items():
+            output = fix_file(filepath, replacements, write=False)
+            if output:
+                writer.write(filepath, output)
+                print(f"✓ {filepath.name}")
+
+    print(f"\nDone! ({index.summary()}; {source_filter.summary()})")
+    if writer.written:
+        print("Undo with python3 utils/write_back.py --rollback")
+
+if __name__ == '__main__':
+    main()
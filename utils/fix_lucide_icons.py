@@ -7,94 +7,170 @@ Fixes:
 3. Removes const keyword from non-constant icon expressions
 """
 
+import argparse
 import os
 import re
+from functools import partial
 from pathlib import Path
 
-# Icon name mappings from incorrect to correct
-ICON_MAPPINGS = {
-    'edit_outlined': 'edit',
-    'lock_outline': 'lock',
-    'bed_outlined': 'bed',
-    'bath_outlined': 'bath',
-    'calendar_outlined': 'calendar',
-    'calendarDays_available_outlined': 'calendarDays',
-    'calendarDays_busy_outlined': 'calendarDays',
-    'cloudUpload': 'cloudUpload',
-    'bookmark_added_outlined': 'bookmark',
-    'badgeCheck_outlined': 'badgeCheck',
-    'creditCards_outlined': 'creditCard',
-    'building_outlined': 'building',
-    'mapPin_outlined': 'mapPin',
-    'star_rounded': 'star',
-}
+from codemod_runner import (SourceFilter, add_jobs_argument, add_preview_arguments,
+                            add_walk_arguments, iter_dart_files, map_files, preview_files)
+from prefilter import Prefilter, add_prefilter_argument
+from rule_packs import load_pack
+from run_cache import RunCache, add_cache_argument, rules_fingerprint
+from write_back import WriteBack, atomic_write
 
-def fix_file(filepath):
-    """Fix LucideIcons errors in a single file."""
-    # Skip if it's a directory
-    if not filepath.is_file():
-        return False
-    
-    with open(filepath, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    original_content = content
-    
+# Icon name mappings from incorrect to correct (rules/fix_lucide_icons.json)
+ICON_MAPPINGS = load_pack('fix_lucide_icons').mappings()
+
+# A file can only change if one of these is present (see prefilter.py)
+TRIGGERS = [
+    re.escape('LucideLucideIcons'),
+    r'LucideIcons\.(?:' + '|'.join(re.escape(old) for old in ICON_MAPPINGS) + r')\b',
+    r'\bconst\s+(?:Icon\s*\(\s*|GradientIcon\s*\(\s*icon:\s*)LucideIcons\.',
+]
+
+def fix_lucide_names(content, fired=None):
+    """Fix the LucideLucideIcons typo and incorrect icon names."""
     # Fix 1: Replace LucideLucideIcons with LucideIcons
+    if fired is not None:
+        fired.extend(['LucideLucideIcons -> LucideIcons'] * content.count('LucideLucideIcons'))
     content = content.replace('LucideLucideIcons', 'LucideIcons')
     
     # Fix 2: Replace incorrect icon names
     for old_name, new_name in ICON_MAPPINGS.items():
         # Match LucideIcons.old_name
-        content = re.sub(
+        content, count = re.subn(
             rf'LucideIcons\.{re.escape(old_name)}\b',
             f'LucideIcons.{new_name}',
             content
         )
+        if fired is not None:
+            fired.extend([f"{old_name} -> {new_name}"] * count)
     
+    return content
+
+def strip_icon_const(content, fired=None):
+    """Remove const from icon expressions that reference LucideIcons."""
     # Fix 3: Remove const from Icon(LucideIcons.xxx) expressions
     # Pattern: const Icon(LucideIcons.xxx
-    content = re.sub(
+    content, count = re.subn(
         r'\bconst\s+Icon\s*\(\s*LucideIcons\.',
         'Icon(LucideIcons.',
         content
     )
+    if fired is not None:
+        fired.extend(['strip const Icon'] * count)
     
     # Fix 4: Remove const from GradientIcon(icon: LucideIcons.xxx) expressions
-    content = re.sub(
+    content, count = re.subn(
         r'\bconst\s+GradientIcon\s*\(\s*icon:\s*LucideIcons\.',
         'GradientIcon(icon: LucideIcons.',
         content
     )
+    if fired is not None:
+        fired.extend(['strip const GradientIcon'] * count)
     
-    # Only write if content changed
-    if content != original_content:
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(content)
-        return True
-    return False
+    return content
+
+def fix_content(content, fired=None):
+    """Apply every LucideIcons fix to file content."""
+    return strip_icon_const(fix_lucide_names(content, fired), fired)
+
+def rewrite(path, content):
+    """Rewrite hook for --dry-run/--diff: returns (content, per-match rule labels)."""
+    fired = []
+    content = fix_content(content, fired)
+    return content, fired
+
+def fix_file(filepath, write=True):
+    """
+    Fix LucideIcons errors in a single file; returns None if it could not be fixed.
+
+    With write=False the new content is returned in place of True, for a
+    WriteBack in the parent process (see write_back.py).
+    """
+    # Skip if it's a directory
+    if not filepath.is_file():
+        return False
+    
+    try:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            content = f.read()
+        
+        original_content = content
+        content = fix_content(content)
+        
+        # Only write if content changed
+        if content != original_content:
+            if not write:
+                return content
+            atomic_write(filepath, content)
+            return True
+        return False
+    except Exception as e:
+        print(f"Error processing {filepath}: {e}")
+        return None
 
 def main():
     """Main function to process all Dart files."""
-    project_root = Path(__file__).parent
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_jobs_argument(parser)
+    add_cache_argument(parser)
+    add_preview_arguments(parser)
+    add_prefilter_argument(parser)
+    add_walk_arguments(parser)
+    args = parser.parse_args()
+    
+    project_root = Path(__file__).resolve().parent.parent
     lib_dir = project_root / 'lib'
     
     if not lib_dir.exists():
         print(f"Error: {lib_dir} does not exist")
         return
     
-    # Find all .dart files
-    dart_files = list(lib_dir.rglob('*.dart'))
+    prefilter = Prefilter(TRIGGERS, args.use_prefilter)
+    source_filter = SourceFilter.from_args(args)
+    
+    if args.dry_run or args.diff:
+        preview_files(rewrite, prefilter.filter(iter_dart_files(lib_dir, source_filter)),
+                      args.jobs, args.diff)
+        return
+    
+    cache = RunCache.for_tool(project_root, 'fix_lucide_icons',
+                              rules_fingerprint(ICON_MAPPINGS), args.use_cache)
+    source_filter.cleared = cache.is_unchanged
+    dart_files = prefilter.filter(
+        path for path in iter_dart_files(lib_dir, source_filter) if not cache.is_current(path)
+    )
     
-    print(f"Found {len(dart_files)} Dart files")
+    file_count = 0
     fixed_count = 0
     
-    for dart_file in dart_files:
-        if fix_file(dart_file):
-            print(f"Fixed: {dart_file.relative_to(project_root)}")
-            fixed_count += 1
+    writer = WriteBack.for_root(project_root, on_written=cache.record)
+    try:
+        with writer:
+            for dart_file, fixed in map_files(partial(fix_file, write=False),
+                                              dart_files, args.jobs):
+                file_count += 1
+                if fixed is None:
+                    continue
+                if fixed:
+                    writer.write(dart_file, fixed)
+                    print(f"Fixed: {dart_file.relative_to(project_root)}")
+                    fixed_count += 1
+                else:
+                    cache.record(dart_file)
+    finally:
+        cache.save()
     
-    print(f"\nTotal files fixed: {fixed_count}")
+    print(f"\nFound {file_count + cache.skipped + prefilter.skipped_files} Dart files "
+          f"({cache.skipped} unchanged since last run, {prefilter.summary()}; "
+          f"{source_filter.summary()})")
+    print(f"Total files fixed: {fixed_count}")
+    if writer.written:
+        print("Undo with python3 utils/write_back.py --rollback")
 
 if __name__ == '__main__':
     main()
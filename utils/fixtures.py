@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+"""
+Generate production-sized dummy_data fixtures for load testing.
+
+The reference tables (property, listing and attribute types, billing
+periods), the amenity and image pools and the base city list are read from
+the hand-written dummy_data/properties.json and dummy_data/city.json, so
+the output keeps their schema: properties with their images, attributes and
+billing periods, and cities whose ``propertuCOunt`` is the number of
+generated properties in that city.
+
+Rows are streamed to disk as they are generated: the properties array goes
+straight into the output file while the child tables are spooled to
+temporary files and appended afterwards, so memory stays flat from 10k to
+1M rows. ``--minify`` drops all whitespace; ``--shard-size`` splits the
+rows over several files behind a small index, to measure how asset decode
+time scales with file size. ``--compact`` re-encodes existing JSON files
+minified and reports the saving.
+
+Examples:
+    python3 utils/fixtures.py --properties 100000 --cities 10000
+    python3 utils/fixtures.py --properties 1000000 --minify --shard-size 50000
+    python3 utils/fixtures.py --compact dummy_data/properties.json dummy_data/city.json
+"""
+
+import argparse
+import json
+import random
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DATA_DIR = PROJECT_ROOT / 'dummy_data'
+
+REFERENCE_TABLES = ('ref_property_types', 'ref_listing_types', 'ref_billing_periods',
+                    'ref_property_attribute_types')
+CHILD_TABLES = ('property_images', 'property_attributes', 'property_billing_periods')
+
+EXTRA_AMENITIES = ['PARKING', 'POOL', 'GYM', 'SECURITY', 'FURNISHED', 'LAUNDRY', 'PET_FRIENDLY']
+ADJECTIVES = ['Sunrise', 'Green', 'Cozy', 'Modern', 'Bright', 'Quiet', 'Grand', 'Urban',
+              'Garden', 'Skyline', 'Harbor', 'Palm']
+
+# Rough bounding box of Indonesia, where the hand-written fixtures are
+LATITUDE = (-8.5, 3.5)
+LONGITUDE = (95.0, 141.0)
+
+EPOCH = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+def load_schema(data_dir=DATA_DIR):
+    """Reference tables and value pools from the hand-written fixtures."""
+    with open(Path(data_dir) / 'properties.json', 'r', encoding='utf-8') as f:
+        properties = json.load(f)
+    with open(Path(data_dir) / 'city.json', 'r', encoding='utf-8') as f:
+        cities = json.load(f)['citys']
+
+    samples = properties['properties']
+    amenities = sorted({amenity for sample in samples for amenity in sample['amenities']})
+    return {
+        'tables': {name: properties[name] for name in REFERENCE_TABLES},
+        'amenities': amenities + [name for name in EXTRA_AMENITIES if name not in amenities],
+        'property_images': sorted({image['url'] for image in properties['property_images']}),
+        'currency': samples[0]['currency'],
+        'country': samples[0]['country'],
+        'city_names': [city['name'] for city in cities],
+        'city_images': [city['image'] for city in cities],
+    }
+
+def city_name(schema, index):
+    """Name of the index-th generated city; the hand-written ones come first."""
+    names = schema['city_names']
+    base = names[index % len(names)]
+    return base if index < len(names) else f"{base} {index // len(names) + 1}"
+
+def _timestamp(moment):
+    return moment.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+def generate_properties(schema, count, city_count, city_totals, seed=0):
+    """
+    Yield (property, {child table: rows}) for count properties.
+
+    city_totals[i] is incremented for every property placed in city i.
+    """
+    rng = random.Random(seed)
+    tables = schema['tables']
+    property_types = tables['ref_property_types']
+    listing_types = tables['ref_listing_types']
+    billing_periods = tables['ref_billing_periods']
+    attribute_types = tables['ref_property_attribute_types']
+    width = max(3, len(str(count)))
+    image_id = attribute_id = 0
+
+    for index in range(1, count + 1):
+        property_id = f"prop-{index:0{width}d}"
+        property_type = rng.choice(property_types)
+        listing_type = rng.choice(listing_types)
+        city = rng.randrange(city_count)
+        city_totals[city] += 1
+        bedrooms = rng.randint(1, 5)
+        created = EPOCH + timedelta(minutes=rng.randrange(525600))
+        updated = created + timedelta(hours=rng.randrange(1, 2000)) if rng.random() < 0.6 else None
+        monthly = rng.randrange(15, 400) * 100000
+        price = monthly * 150 if listing_type['slug'] == 'sale' else monthly
+
+        row = {
+            'id': property_id,
+            'landlordId': f"landlord-{rng.randrange(1, count // 20 + 2)}",
+            'title': f"{rng.choice(ADJECTIVES)} {property_type['label']} - {bedrooms}BR",
+            'description': f"{bedrooms}-bedroom {property_type['label'].lower()} "
+                           f"for {listing_type['label'].lower()} in {city_name(schema, city)}.",
+            'propertyTypeId': property_type['id'],
+            'listingTypeId': listing_type['id'],
+            'amenities': rng.sample(schema['amenities'], rng.randint(1, 4)),
+            'address': f"Jl. Contoh No.{rng.randint(1, 300)}",
+            'city': city_name(schema, city),
+            'country': schema['country'],
+            'latitude': round(rng.uniform(*LATITUDE), 4),
+            'longitude': round(rng.uniform(*LONGITUDE), 4),
+            'price': float(price),
+            'currency': schema['currency'],
+            'isVerified': rng.random() < 0.5,
+            'metadata': {'floor': rng.randint(1, 30), 'unit': rng.choice('ABCD')},
+            'createdAt': _timestamp(created),
+            'updatedAt': _timestamp(updated) if updated else None,
+        }
+
+        children = {table: [] for table in CHILD_TABLES}
+        for position in range(rng.randint(1, 4)):
+            image_id += 1
+            children['property_images'].append({
+                'id': f"img-{image_id}",
+                'propertyId': property_id,
+                'url': rng.choice(schema['property_images']),
+                'isPrimary': position == 0,
+            })
+        values = {'bedroom': bedrooms, 'bathroom': max(1, bedrooms - rng.randint(0, 2)),
+                  'area': bedrooms * rng.randint(25, 45)}
+        for attribute_type in attribute_types:
+            attribute_id += 1
+            children['property_attributes'].append({
+                'id': f"pa-{attribute_id}",
+                'propertyId': property_id,
+                'attributeTypeId': attribute_type['id'],
+                'value': str(values.get(attribute_type['slug'], rng.randint(1, 10))),
+            })
+        if listing_type['slug'] != 'sale':
+            for period in rng.sample(billing_periods, rng.randint(1, len(billing_periods))):
+                children['property_billing_periods'].append({
+                    'propertyId': property_id,
+                    'billingPeriodId': period['id'],
+                })
+
+        yield row, children
+
+def generate_cities(schema, city_totals):
+    """Yield the city rows, with the property count of each."""
+    images = schema['city_images']
+    for index, total in enumerate(city_totals):
+        yield {
+            'id': index + 1,
+            'name': city_name(schema, index),
+            'propertuCOunt': total,
+            'image': images[index % len(images)],
+        }
+
+class JsonStream:
+    """Writes one JSON object key by key, with array values streamed item by item."""
+
+    def __init__(self, f, minify=False):
+        self.f = f
+        self.minify = minify
+        self._keys = 0
+        # One encoder per stream: json.dumps would build a new one per row
+        if minify:
+            self._encode = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False).encode
+        else:
+            self._encode = json.JSONEncoder(indent='\t', ensure_ascii=False).encode
+
+    def encode(self, value, depth):
+        """One value as it appears at depth, without a leading separator."""
+        text = self._encode(value)
+        return text if self.minify else text.replace('\n', '\n' + '\t' * depth)
+
+    def separator(self, index):
+        """What goes before the index-th item of an array."""
+        separator = ',' if index else ''
+        return separator if self.minify else separator + '\n\t\t'
+
+    def begin(self):
+        self.f.write('{')
+
+    def _key(self, key):
+        separator = ',' if self._keys else ''
+        self._keys += 1
+        if self.minify:
+            self.f.write(f'{separator}{json.dumps(key)}:')
+        else:
+            self.f.write(f'{separator}\n\t{json.dumps(key)}: ')
+
+    def value(self, key, value):
+        """Write a key with a complete value."""
+        self._key(key)
+        self.f.write(self.encode(value, 1))
+
+    def array(self, key, items):
+        """Write a key whose array value is streamed from items; returns the count."""
+        self._key(key)
+        self.f.write('[')
+        count = 0
+        for item in items:
+            self.f.write(self.separator(count) + self.encode(item, 2))
+            count += 1
+        self.f.write(']' if self.minify or not count else '\n\t]')
+        return count
+
+    def raw_array(self, key, spool, count):
+        """Write a key whose array items were already encoded into a spool file."""
+        self._key(key)
+        self.f.write('[')
+        spool.seek(0)
+        shutil.copyfileobj(spool, self.f)
+        self.f.write(']' if self.minify or not count else '\n\t]')
+
+    def end(self):
+        self.f.write('}' if self.minify else '\n}\n')
+
+def write_properties(path, rows, head, minify=False):
+    """
+    Stream (property, children) rows into one properties document.
+
+    Properties go straight to path; child rows are encoded into one spool
+    file per table and appended once the properties are done.
+    Returns the number of properties written.
+    """
+    spools = {table: tempfile.TemporaryFile('w+', encoding='utf-8') for table in CHILD_TABLES}
+    counts = dict.fromkeys(CHILD_TABLES, 0)
+    try:
+        with open(path, 'w', encoding='utf-8') as f:
+            stream = JsonStream(f, minify)
+            stream.begin()
+            for key, value in head.items():
+                stream.value(key, value)
+
+            def properties():
+                for row, children in rows:
+                    for table, items in children.items():
+                        for item in items:
+                            spools[table].write(stream.separator(counts[table])
+                                                + stream.encode(item, 2))
+                            counts[table] += 1
+                    yield row
+
+            written = stream.array('properties', properties())
+            for table in CHILD_TABLES:
+                stream.raw_array(table, spools[table], counts[table])
+            stream.end()
+    finally:
+        for spool in spools.values():
+            spool.close()
+    return written
+
+def clear_shards(out_dir, name):
+    """Remove the shards an earlier sharded run left under out_dir/name/."""
+    shard_dir = Path(out_dir) / name
+    if not shard_dir.is_dir():
+        return
+    for path in shard_dir.glob(f"{name}-*.json"):
+        path.unlink()
+    if not any(shard_dir.iterdir()):
+        shard_dir.rmdir()
+
+def write_sharded(out_dir, name, key, rows, head, shard_size, minify, writer=None):
+    """
+    Split rows into shard files under out_dir/name/ behind an index file.
+
+    The index (out_dir/<name>.json) holds head, the row count and the shard
+    paths relative to out_dir. Shards of an earlier run are removed first.
+    Returns the paths written, the index last.
+    """
+    clear_shards(out_dir, name)
+    shard_dir = Path(out_dir) / name
+    shard_dir.mkdir(parents=True, exist_ok=True)
+    shards = []
+    total = 0
+    rows = iter(rows)
+    while True:
+        batch = islice(rows, shard_size)
+        path = shard_dir / f"{name}-{len(shards):05d}.json"
+        if writer is not None:
+            count = writer(path, batch, {}, minify)
+        else:
+            with open(path, 'w', encoding='utf-8') as f:
+                stream = JsonStream(f, minify)
+                stream.begin()
+                count = stream.array(key, batch)
+                stream.end()
+        if not count:
+            path.unlink()
+            break
+        shards.append(path)
+        total += count
+
+    index = Path(out_dir) / f"{name}.json"
+    with open(index, 'w', encoding='utf-8') as f:
+        stream = JsonStream(f, minify)
+        stream.begin()
+        for head_key, value in head.items():
+            stream.value(head_key, value)
+        stream.value('count', total)
+        stream.value('shards', [path.relative_to(out_dir).as_posix() for path in shards])
+        stream.end()
+    return shards + [index]
+
+def compact(paths, out_dir):
+    """Re-encode JSON files minified into out_dir; returns [(path, before, after)]."""
+    results = []
+    for path in paths:
+        path = Path(path)
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        target = Path(out_dir) / f"{path.stem}.min.json"
+        with open(target, 'w', encoding='utf-8') as f:
+            json.dump(data, f, separators=(',', ':'), ensure_ascii=False)
+        results.append((target, path.stat().st_size, target.stat().st_size))
+    return results
+
+def main():
+    """Generate the fixtures, or compact existing ones."""
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--properties', type=int, default=10000,
+                        help='number of properties to generate (default: 10000)')
+    parser.add_argument('--cities', type=int, default=1000,
+                        help='number of cities to generate (default: 1000)')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='random seed for the generator (default: 0)')
+    parser.add_argument('--out', type=Path, default=DATA_DIR / 'generated',
+                        help='output directory (default: dummy_data/generated)')
+    parser.add_argument('--minify', action='store_true',
+                        help='write JSON without any whitespace')
+    parser.add_argument('--shard-size', type=int, metavar='ROWS',
+                        help='split properties and cities into files of at most ROWS rows')
+    parser.add_argument('--compact', nargs='+', type=Path, metavar='JSON',
+                        help='write minified copies of these JSON files to --out instead')
+    args = parser.parse_args()
+
+    args.out.mkdir(parents=True, exist_ok=True)
+
+    if args.compact:
+        for target, before, after in compact(args.compact, args.out):
+            print(f"✓ {target}: {before / 1e3:.1f} kB -> {after / 1e3:.1f} kB "
+                  f"({100 * (before - after) / before:.0f}% smaller)")
+        return
+
+    if args.properties < 1 or args.cities < 1:
+        parser.error('--properties and --cities must be at least 1')
+    if args.shard_size is not None and args.shard_size < 1:
+        parser.error('--shard-size must be at least 1')
+
+    schema = load_schema()
+    city_totals = [0] * args.cities
+    rows = generate_properties(schema, args.properties, args.cities, city_totals, args.seed)
+
+    start = time.perf_counter()
+    if args.shard_size:
+        written = write_sharded(args.out, 'properties', 'properties', rows, schema['tables'],
+                                args.shard_size, args.minify, writer=write_properties)
+        written += write_sharded(args.out, 'city', 'citys', generate_cities(schema, city_totals),
+                                 {}, args.shard_size, args.minify)
+    else:
+        written = [args.out / 'properties.json', args.out / 'city.json']
+        # Shards of an earlier sharded run would sit next to the new files
+        clear_shards(args.out, 'properties')
+        clear_shards(args.out, 'city')
+        write_properties(written[0], rows, schema['tables'], args.minify)
+        with open(written[1], 'w', encoding='utf-8') as f:
+            stream = JsonStream(f, args.minify)
+            stream.begin()
+            stream.array('citys', generate_cities(schema, city_totals))
+            stream.end()
+    elapsed = time.perf_counter() - start
+
+    total = sum(path.stat().st_size for path in written)
+    print(f"Generated {args.properties} properties and {args.cities} cities "
+          f"({total / 1e6:.1f} MB) in {elapsed:.1f}s under {args.out}", file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
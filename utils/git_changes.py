@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Changed-files mode: the Dart files under lib/ touched since a git revision.
+
+``--since <rev>`` selects the files that differ between <rev> and the
+working tree, plus untracked files; ``--staged`` selects the files staged
+in the index, for pre-commit hooks. Renamed files are reported under their
+new path and deleted files are left out. Only git's own diff of the range
+is read, so the cost scales with the size of the change rather than the
+number of files under lib/.
+
+Examples:
+    python3 utils/git_changes.py --since origin/main
+    python3 utils/git_changes.py --staged
+"""
+
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+
+from codemod_runner import SourceFilter, iter_dart_files
+
+# Added, copied, modified, renamed or type-changed: everything still on disk
+DIFF_FILTER = 'ACMRT'
+
+class GitError(RuntimeError):
+    """Raised when git cannot list the changed files."""
+
+def add_changes_arguments(parser):
+    """Register the mutually exclusive --since/--staged options."""
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--since', metavar='REV',
+                       help='only process .dart files changed since REV (plus untracked files)')
+    group.add_argument('--staged', action='store_true',
+                       help='only process .dart files staged for commit')
+
+def _git(lib_dir, *args):
+    """Run git in lib_dir and return the NUL-separated paths it prints."""
+    try:
+        result = subprocess.run(['git', '-C', str(lib_dir), *args],
+                                capture_output=True, check=True)
+    except FileNotFoundError as e:
+        raise GitError('git is not installed') from e
+    except subprocess.CalledProcessError as e:
+        raise GitError(e.stderr.decode('utf-8', 'replace').strip()) from e
+    return [path for path in result.stdout.decode('utf-8').split('\0') if path]
+
+def changed_dart_files(lib_dir, since=None, staged=False, source_filter=None):
+    """
+    Sorted .dart files under lib_dir changed since a revision or staged.
+
+    Paths come back relative to lib_dir (``--relative``), so a diff of a
+    large repository never lists anything outside it. They go through the
+    same SourceFilter as a full walk, so generated files stay skipped.
+    """
+    lib_dir = Path(lib_dir)
+    diff = ['diff', '--name-only', '-z', '-M', f'--diff-filter={DIFF_FILTER}', '--relative']
+    if staged:
+        paths = _git(lib_dir, *diff, '--cached')
+    else:
+        paths = _git(lib_dir, *diff, since, '--')
+        paths += _git(lib_dir, 'ls-files', '--others', '--exclude-standard', '-z')
+
+    source_filter = SourceFilter() if source_filter is None else source_filter
+    return [
+        lib_dir / path for path in sorted(set(paths))
+        if path.endswith('.dart') and source_filter.accepts(lib_dir / path, path)
+    ]
+
+def selected_dart_files(args, lib_dir, source_filter=None):
+    """The files a tool should process: the changed ones, or all of lib_dir."""
+    if args.since is None and not args.staged:
+        return iter_dart_files(lib_dir, source_filter)
+    return changed_dart_files(lib_dir, args.since, args.staged, source_filter)
+
+def main():
+    """Print the changed .dart files."""
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('lib_dir', nargs='?', default='lib',
+                        help='directory to restrict the diff to (default: lib)')
+    add_changes_arguments(parser)
+    args = parser.parse_args()
+
+    if args.since is None and not args.staged:
+        parser.error('pass --since REV or --staged')
+
+    try:
+        paths = changed_dart_files(args.lib_dir, args.since, args.staged)
+    except GitError as e:
+        print(f"Error listing changed files: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    for path in paths:
+        print(path)
+
+if __name__ == '__main__':
+    main()
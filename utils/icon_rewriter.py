@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Single-pass rewrite engine for the Material -> Lucide icon mapping tables.
+
+The migration scripts historically applied their mapping tables one rule at a
+time, so a file was scanned twice per rule and later rules also saw the output
+of earlier ones (that cascade is where ``LucideLucideIcons`` comes from).
+
+Every rule matches ``Icons.`` followed by identifier characters only, and every
+replacement is made of identifier characters only. A cascade therefore never
+leaves the dotted identifier it started in. The engine finds each dotted
+identifier that any rule can touch with one combined matcher, resolves it once
+through the rule table in order, and reuses that result for every later
+occurrence. The output is identical to the sequential loop.
+"""
+
+import re
+import string
+
+# Characters a rule match or a replacement can consist of
+IDENTIFIER_CHARS = frozenset(string.ascii_letters + string.digits + '_.')
+
+# Rule sources must be ``Icons\.`` followed by literals and optional groups
+RULE_SOURCE = re.compile(r'Icons\\\.[A-Za-z0-9_()?|]+')
+RULE_TARGET = re.compile(r'[A-Za-z0-9_.]+')
+
+
+def matcher_source(sources):
+    """
+    Regex source of the combined matcher over rule sources, not compiled.
+
+    One alternation over every rule body; it only has to find a spot where
+    at least one rule applies, the rule order is handled by IconRewriter.
+    Scripts use it as a prefilter trigger without building the rewriter.
+    """
+    prefix = len(r'Icons\.')
+    alternatives = '|'.join(f'(?:{source[prefix:]})' for source in sources)
+    return rf'Icons\.(?:{alternatives})'
+
+
+class IconRewriter:
+    """Compiled form of an ordered ``{pattern: replacement}`` icon table."""
+
+    def __init__(self, mappings):
+        self.rules = []
+        for source, replacement in mappings.items():
+            if not RULE_SOURCE.fullmatch(source) or not RULE_TARGET.fullmatch(replacement):
+                raise ValueError(f"Unsupported icon rule: {source} -> {replacement}")
+            self.rules.append((source, re.compile(source), replacement))
+
+        self.matcher = re.compile(matcher_source(source for source, _, _ in self.rules))
+        self._resolved = {}
+
+    def resolve(self, token):
+        """Run one dotted identifier through every rule in table order."""
+        cached = self._resolved.get(token)
+        if cached is not None:
+            return cached
+
+        text = token
+        hits = []
+        for index, (_, pattern, replacement) in enumerate(self.rules):
+            text, count = pattern.subn(replacement, text)
+            if count:
+                hits.append((index, count))
+
+        resolved = (text, tuple(hits))
+        self._resolved[token] = resolved
+        return resolved
+
+    def rewrite(self, content):
+        """
+        Rewrite content in one left-to-right scan.
+
+        Returns the new content and a list of ``(pattern, replacement, count)``
+        for every rule that fired, in table order.
+        """
+        pieces = []
+        counts = {}
+        position = 0
+        length = len(content)
+
+        match = self.matcher.search(content)
+        while match:
+            start = match.start()
+            while start > position and content[start - 1] in IDENTIFIER_CHARS:
+                start -= 1
+            end = match.end()
+            while end < length and content[end] in IDENTIFIER_CHARS:
+                end += 1
+
+            text, hits = self.resolve(content[start:end])
+            pieces.append(content[position:start])
+            pieces.append(text)
+            for index, count in hits:
+                counts[index] = counts.get(index, 0) + count
+
+            position = end
+            match = self.matcher.search(content, end)
+
+        if not pieces:
+            return content, []
+
+        pieces.append(content[position:])
+        fired = [
+            (self.rules[index][0], self.rules[index][2], counts[index])
+            for index in sorted(counts)
+        ]
+        return ''.join(pieces), fired
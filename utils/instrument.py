@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Run instrumentation for the migration pipeline.
+
+RunReport aggregates the FileContext of every processed file into per-stage
+and per-rule statistics (match counts, files, bytes scanned, wall time) plus
+a per-file breakdown, and lists the rules that never matched so dead rules
+can be deleted. Rules are not timed one by one - those compiled into a
+single-pass matcher run as one scan - so a rule's matched_files_stage_seconds
+is the wall time of its whole stage, summed over the files the rule matched;
+the per-stage times show where the time goes.
+
+Only migrate.py takes --report and --profile. The standalone scripts run one
+pass each and have no per-stage timings to report; use their --dry-run for
+per-rule match counts.
+"""
+
+import cProfile
+import json
+import time
+from contextlib import contextmanager
+
+def add_report_arguments(parser):
+    """Register migrate.py's --report and --profile options on an argparse parser."""
+    parser.add_argument(
+        '--report',
+        metavar='PATH',
+        help='write a JSON run report with per-rule and per-file statistics',
+    )
+    parser.add_argument(
+        '--profile',
+        metavar='PATH',
+        help='write a cProfile dump of the run (of the parent process with --jobs)',
+    )
+
+@contextmanager
+def profiled(path):
+    """Profile the enclosed block into path; does nothing if path is None."""
+    if path is None:
+        yield
+        return
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
+
+class RunReport:
+    """Collects per-stage, per-rule and per-file statistics for one run."""
+
+    def __init__(self, inventory=()):
+        # inventory: every (stage, rule label) that could fire
+        self.inventory = list(inventory)
+        self.started = time.perf_counter()
+        self.stages = {}
+        self.rules = {}
+        self.files = []
+
+    def add(self, context):
+        """Fold one file's FileContext into the report."""
+        for stage, seconds in context.stage_seconds.items():
+            stats = self.stages.setdefault(stage, {
+                'files': 0, 'changed_files': 0, 'seconds': 0.0, 'bytes_scanned': 0,
+            })
+            stats['files'] += 1
+            stats['seconds'] += seconds
+            stats['bytes_scanned'] += context.stage_bytes.get(stage, 0)
+            if stage in context.applied:
+                stats['changed_files'] += 1
+
+        for stage, hits in context.rule_hits.items():
+            for rule, count in hits.items():
+                stats = self.rules.setdefault((stage, rule), {
+                    'matches': 0, 'files': 0, 'bytes_scanned': 0,
+                    'matched_files_stage_seconds': 0.0,
+                })
+                stats['matches'] += count
+                stats['files'] += 1
+                stats['bytes_scanned'] += context.stage_bytes.get(stage, 0)
+                stats['matched_files_stage_seconds'] += context.stage_seconds.get(stage, 0.0)
+
+        self.files.append({
+            'path': context.path,
+            'bytes': context.bytes,
+            'seconds': round(context.seconds, 6),
+            'modified': context.modified,
+            'error': context.error,
+            'stages': {
+                stage: round(seconds, 6) for stage, seconds in context.stage_seconds.items()
+            },
+            'rules': {
+                stage: dict(hits) for stage, hits in context.rule_hits.items()
+            },
+        })
+
+    def to_dict(self):
+        """The report as a JSON-serialisable dict."""
+        fired = set(self.rules)
+        rules = [
+            {'stage': stage, 'rule': rule, **stats}
+            for (stage, rule), stats in sorted(
+                self.rules.items(), key=lambda item: -item[1]['matches'])
+        ]
+        return {
+            'wall_seconds': round(time.perf_counter() - self.started, 4),
+            'files': len(self.files),
+            'modified_files': sum(1 for entry in self.files if entry['modified']),
+            'bytes': sum(entry['bytes'] for entry in self.files),
+            'stages': {
+                stage: dict(stats, seconds=round(stats['seconds'], 6))
+                for stage, stats in sorted(
+                    self.stages.items(), key=lambda item: -item[1]['seconds'])
+            },
+            'rules': rules,
+            'dead_rules': [
+                {'stage': stage, 'rule': rule}
+                for stage, rule in self.inventory if (stage, rule) not in fired
+            ],
+            'files_detail': self.files,
+        }
+
+    def write(self, path):
+        """Write the report as JSON."""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2)
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Offline validator for LucideIcons identifiers.
+
+The set of valid names is read from the ``lucide_icons`` package source in
+the local pub cache, at the version pinned in pubspec.lock, and cached under
+.codemod_cache/ so later runs load it without touching the package. Every
+rewrite target of the rule tables and every ``LucideIcons.<name>`` under
+lib/ is then checked in one scan, without running ``flutter analyze``.
+Invalid names get the nearest valid names as suggestions (snake_case to
+lowerCamelCase, Material suffixes dropped, the same words reordered, then
+edit distance).
+
+Examples:
+    python3 utils/lucide_names.py
+    python3 utils/lucide_names.py --json invalid.json --fail-on-invalid
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from pathlib import Path
+
+from codemod_runner import SourceFilter, add_walk_arguments, iter_dart_files
+from rule_packs import load_pack
+from run_cache import CACHE_DIR
+
+PACKAGE = 'lucide_icons'
+
+# `static const IconData activity = LucideIconData(0xe038);`
+DECLARATION = re.compile(r'static\s+const\s+(?:IconData\s+)?([A-Za-z_$][\w$]*)\s*=')
+
+USAGE = re.compile(r'\b(?:Lucide)+Icons\.(\w+)')
+
+def locked_version(lockfile, package=PACKAGE):
+    """Version of package pinned in a pubspec.lock, or None."""
+    try:
+        with open(lockfile, 'r', encoding='utf-8') as f:
+            text = f.read()
+    except OSError:
+        return None
+
+    block = re.search(rf'^  {re.escape(package)}:\n((?:    .*\n)+)', text, re.MULTILINE)
+    if block is None:
+        return None
+    version = re.search(r'^    version: "([^"]+)"', block.group(1), re.MULTILINE)
+    return version.group(1) if version else None
+
+def pub_cache_dirs():
+    """Candidate pub cache roots, most specific first."""
+    dirs = []
+    if os.environ.get('PUB_CACHE'):
+        dirs.append(Path(os.environ['PUB_CACHE']))
+    if os.environ.get('LOCALAPPDATA'):
+        dirs.append(Path(os.environ['LOCALAPPDATA']) / 'Pub' / 'Cache')
+    dirs.append(Path.home() / '.pub-cache')
+    return dirs
+
+def package_source(version, package=PACKAGE):
+    """lib/ directory of the hosted package in the pub cache, or None."""
+    for cache in pub_cache_dirs():
+        for host in ('pub.dev', 'pub.dartlang.org'):
+            lib_dir = cache / 'hosted' / host / f'{package}-{version}' / 'lib'
+            if lib_dir.is_dir():
+                return lib_dir
+    return None
+
+def scan_declarations(lib_dir):
+    """Every static const icon name declared under the package's lib/."""
+    names = set()
+    # The icon table of the package may well be marked as generated
+    for path in iter_dart_files(lib_dir, SourceFilter(skip_generated=False)):
+        with open(path, 'r', encoding='utf-8') as f:
+            names.update(DECLARATION.findall(f.read()))
+    return names
+
+def edit_distance(a, b, limit):
+    """Levenshtein distance, or limit + 1 as soon as it must exceed limit."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1,
+                               previous[j - 1] + (char_a != char_b)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+def snake_to_camel(name):
+    head, *rest = name.split('_')
+    return head + ''.join(part[:1].upper() + part[1:] for part in rest)
+
+def word_key(name):
+    """Order-insensitive key of the words in a camelCase or snake_case name."""
+    words = re.findall(r'[A-Z]?[a-z]+|[A-Z]+(?![a-z])|\d+', name)
+    return tuple(sorted(word.lower() for word in words))
+
+class LucideNames:
+    """Set of valid LucideIcons identifiers with nearest-name suggestions."""
+
+    def __init__(self, names, version=None):
+        self.names = frozenset(names)
+        self.version = version
+        self._sorted = sorted(self.names)
+        self._by_words = {}
+        for name in self._sorted:
+            self._by_words.setdefault(word_key(name), []).append(name)
+
+    @classmethod
+    def load(cls, root='.', use_cache=True):
+        """
+        Names for the version pinned in <root>/pubspec.lock, or None.
+
+        The cache file is keyed by version, so bumping the package in
+        pubspec.lock rebuilds it from the new source.
+        """
+        version = locked_version(Path(root) / 'pubspec.lock')
+        if version is None:
+            return None
+
+        cache_path = Path(root) / CACHE_DIR / f'{PACKAGE}-{version}.names'
+        if use_cache and cache_path.exists():
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                return cls(f.read().split(), version)
+
+        lib_dir = package_source(version)
+        if lib_dir is None:
+            return None
+        names = scan_declarations(lib_dir)
+        if not names:
+            return None
+
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = cache_path.with_suffix('.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(sorted(names)))
+        os.replace(temp_path, cache_path)
+        return cls(names, version)
+
+    def __contains__(self, name):
+        return name in self.names
+
+    def is_valid(self, name):
+        return name in self.names
+
+    def suggest(self, name, limit=3):
+        """Up to limit valid names close to name, best first."""
+        suggestions = []
+        head = name.split('_')[0]
+        exact = [snake_to_camel(name), head]
+        exact += self._by_words.get(word_key(name), [])
+        for candidate in exact:
+            if candidate in self.names and candidate not in suggestions:
+                suggestions.append(candidate)
+
+        # Compare the whole name and the part before a Material suffix
+        limits = {text: max(2, len(text) // 4) for text in (name, head)}
+        ranked = []
+        for candidate in self._sorted:
+            distance = min(
+                edit_distance(text, candidate, limit) - limit
+                for text, limit in limits.items()
+            )
+            if distance <= 0:
+                ranked.append((distance, candidate))
+        for _, candidate in sorted(ranked):
+            if candidate not in suggestions:
+                suggestions.append(candidate)
+        return suggestions[:limit]
+
+def rewrite_targets():
+    """(where, LucideIcons name) for every target of the rule tables."""
+    from rule_compiler import LUCIDE_PREFIX, REPAIR_PACK, CompiledRules
+
+    targets = []
+    compiled = CompiledRules.load()
+    for rule in compiled.rules:
+        targets.append((f"{rule.table}: {rule.source}", rule.replacement[len(LUCIDE_PREFIX):]))
+    for name, (target, _) in sorted(compiled.targets.items()):
+        targets.append((f"compiled: Icons.{name}", target[len(LUCIDE_PREFIX):]))
+    for old, new in load_pack(REPAIR_PACK).rules:
+        targets.append((f"{REPAIR_PACK}: {old}", new))
+    for pattern, replacement in load_pack('final_cleanup').rules:
+        if replacement.startswith(LUCIDE_PREFIX):
+            targets.append((f"final_cleanup: {pattern}", replacement[len(LUCIDE_PREFIX):]))
+    return targets
+
+def check_usages(paths, names):
+    """(location, name) of every invalid LucideIcons.<name> in paths."""
+    invalid = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        for match in USAGE.finditer(content):
+            if match.group(1) not in names or not match.group().startswith('LucideIcons.'):
+                line = content.count('\n', 0, match.start()) + 1
+                invalid.append((f"{path}:{line}", match.group(1)))
+    return invalid
+
+def main():
+    """Check rule targets and lib/ usages against the pinned lucide_icons."""
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('lib_dir', nargs='?', default='lib',
+                        help='directory to scan (default: lib)')
+    parser.add_argument('--rebuild', action='store_true',
+                        help='rebuild the cached name set from the pub cache')
+    parser.add_argument('--json', metavar='PATH',
+                        help='also write the invalid names and suggestions as JSON')
+    parser.add_argument('--fail-on-invalid', action='store_true',
+                        help='exit with status 1 if any name is invalid')
+    add_walk_arguments(parser)
+    args = parser.parse_args()
+
+    names = LucideNames.load('.', use_cache=not args.rebuild)
+    if names is None:
+        version = locked_version('pubspec.lock')
+        print(f"No {PACKAGE} source found for version {version} in the pub cache; "
+              f"run `flutter pub get` first", file=sys.stderr)
+        sys.exit(2)
+
+    invalid_targets = [(where, name) for where, name in rewrite_targets() if name not in names]
+    invalid_usages = check_usages(
+        iter_dart_files(Path(args.lib_dir), SourceFilter.from_args(args)), names)
+
+    entries = []
+    for kind, items in (('target', invalid_targets), ('usage', invalid_usages)):
+        print(f"=== Invalid LucideIcons {kind}s ({len(items)}) ===")
+        for where, name in items:
+            suggestions = names.suggest(name)
+            hint = f"  (did you mean {', '.join(suggestions)}?)" if suggestions else ""
+            print(f"{where}: LucideIcons.{name}{hint}")
+            entries.append({'kind': kind, 'where': where, 'name': name,
+                            'suggestions': suggestions})
+        print()
+
+    print(f"{len(names.names)} valid names in {PACKAGE} {names.version}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(entries, f, indent=2)
+
+    if args.fail_on_invalid and entries:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
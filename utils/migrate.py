@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Full Lucide migration in one pass.
+
+Runs the transforms of replace_icons.py, cleanup_remaining.py,
+fix_lucide_icons.py and final_cleanup.py as ordered pipeline stages, so each
+Dart file is read once and written at most once.
+
+The default engine rewrites icons with the rule table compiled by
+rule_compiler.py: one whole-identifier pass straight to the final Lucide
+names, with no repair stages, and restores ``const`` on constant widget
+expressions (const_restorer.py) instead of stripping it. ``--engine legacy``
+runs the original tables in order instead, and gives the same result as
+running the four scripts one after another.
+
+``--prune-material`` also drops ``package:flutter/material.dart`` from
+files the icon rewrite left without any Material usage (see
+dart_imports.py).
+
+``--since <rev>`` and ``--staged`` limit the run to the Dart files changed
+in git (see git_changes.py). Changed files are written back atomically with
+a journal of their original bytes, and ``--rollback`` restores the last run
+(see write_back.py).
+"""
+
+import argparse
+import re
+import sys
+from functools import partial
+from pathlib import Path
+
+import cleanup_remaining
+import final_cleanup
+import fix_lucide_icons
+import replace_icons
+
+from codemod_runner import (SourceFilter, add_jobs_argument, add_preview_arguments,
+                            add_walk_arguments, map_files, preview_files)
+from const_restorer import CONSTRUCTOR_CALL, project_table, restore_const
+from dart_imports import prune_material_import
+from git_changes import GitError, add_changes_arguments, selected_dart_files
+from instrument import RunReport, add_report_arguments, profiled
+from pipeline import Pipeline
+from prefilter import add_prefilter_argument
+from rule_compiler import CompiledRules, label
+from run_cache import RunCache, add_cache_argument, rules_fingerprint
+from write_back import WriteBack, add_rollback_argument, run_rollback
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+COMPILED_RULES = CompiledRules.load()
+
+def build_compiled_pipeline(root=PROJECT_ROOT, prune_material=False):
+    """Register the stages of the compiled engine."""
+    pipeline = Pipeline(root)
+
+    @pipeline.stage('rewrite_icons', triggers=[COMPILED_RULES.matcher.pattern])
+    def _rewrite_icons(content, context):
+        content, rules = COMPILED_RULES.rewrite(content)
+        for pattern, replacement, count in rules:
+            context.fired.extend([f"{pattern} -> {replacement}"] * count)
+        context.replacements.extend(rules)
+        return content
+
+    @pipeline.stage('remove_box_shadows', triggers=[re.escape('boxShadow')])
+    def _remove_box_shadows(content, context):
+        return replace_icons.remove_box_shadows(content, context.fired)
+
+    # Also covers files that already use LucideIcons without the import
+    @pipeline.stage('add_lucide_import',
+                    triggers=[COMPILED_RULES.matcher.pattern, re.escape('LucideIcons')])
+    def _add_lucide_import(content, context):
+        if not context.replacements and not ('Icons.' in content and 'LucideIcons' in content):
+            return content
+        updated = replace_icons.add_lucide_import(content)
+        if updated != content:
+            context.fired.append('add lucide import')
+        return updated
+
+    if prune_material:
+        # Files that only imported material.dart for Icons no longer need it
+        @pipeline.stage('prune_material_import', triggers=[COMPILED_RULES.matcher.pattern])
+        def _prune_material_import(content, context):
+            if not context.replacements:
+                return content
+            updated = prune_material_import(content)
+            if updated != content:
+                context.fired.append('remove material import')
+            return updated
+
+    # LucideIcons members are const, so instead of stripping const from icon
+    # widgets (as the legacy fix pass does) put it back where it can go
+    @pipeline.stage('restore_const', triggers=[CONSTRUCTOR_CALL])
+    def _restore_const(content, context):
+        content, _ = restore_const(content, project_table(), context.fired)
+        return content
+
+    return pipeline
+
+def build_legacy_pipeline(root=PROJECT_ROOT):
+    """Register the migration stages in the order the scripts used to run."""
+    pipeline = Pipeline(root)
+
+    @pipeline.stage('replace_icons', triggers=replace_icons.TRIGGERS[:1])
+    def _replace_icons(content, context):
+        content, replacements = replace_icons.replace_icons(content, context.fired)
+        context.replacements.extend(replacements)
+        return content
+
+    @pipeline.stage('remove_box_shadows', triggers=[re.escape('boxShadow')])
+    def _remove_box_shadows(content, context):
+        return replace_icons.remove_box_shadows(content, context.fired)
+
+    # Only runs after replace_icons changed something, so it shares its trigger
+    @pipeline.stage('add_lucide_import', triggers=replace_icons.TRIGGERS[:1])
+    def _add_lucide_import(content, context):
+        if not context.replacements:
+            return content
+        updated = replace_icons.add_lucide_import(content)
+        if updated != content:
+            context.fired.append('add lucide import')
+        return updated
+
+    # Runs wherever its tokens are still present, like the standalone script
+    # does with the token index
+    @pipeline.stage('cleanup_remaining', triggers=cleanup_remaining.TRIGGERS)
+    def _cleanup_remaining(content, context):
+        return cleanup_remaining.cleanup_content(content, context.fired)
+
+    @pipeline.stage('fix_lucide_names', triggers=fix_lucide_icons.TRIGGERS[:2])
+    def _fix_lucide_names(content, context):
+        return fix_lucide_icons.fix_lucide_names(content, context.fired)
+
+    @pipeline.stage('strip_icon_const', triggers=fix_lucide_icons.TRIGGERS[2:])
+    def _strip_icon_const(content, context):
+        return fix_lucide_icons.strip_icon_const(content, context.fired)
+
+    @pipeline.stage('final_cleanup',
+                    triggers=[pattern for pattern, _ in final_cleanup.FINAL_FIXES])
+    def _final_cleanup(content, context):
+        return final_cleanup.apply_fixes(content, final_cleanup.FINAL_FIXES, context.fired)
+
+    return pipeline
+
+PIPELINES = {
+    'compiled': build_compiled_pipeline(),
+    'legacy': build_legacy_pipeline(),
+}
+
+PIPELINE = PIPELINES['compiled']
+
+# The compiled engine with the opt-in prune_material_import stage
+PRUNING_PIPELINE = build_compiled_pipeline(prune_material=True)
+
+def pipeline_for(engine='compiled', prune_material=False):
+    """The pipeline of an engine, with or without --prune-material."""
+    return PRUNING_PIPELINE if prune_material else PIPELINES[engine]
+
+def pipeline_fingerprint(engine='compiled', prune_material=False):
+    """Fingerprint of every rule table and file list the pipeline uses."""
+    return rules_fingerprint(
+        replace_icons.ICON_MAPPINGS,
+        cleanup_remaining.REMAINING_ICON_MAPPINGS,
+        fix_lucide_icons.ICON_MAPPINGS,
+        [(stage.name, sorted(stage.paths or []))
+         for stage in pipeline_for(engine, prune_material).stages],
+        final_cleanup.FINAL_FIXES,
+        # The const table comes from the project's own declarations
+        [('const_table', project_table().fingerprint() if engine == 'compiled' else None)],
+    )
+
+def rule_inventory(engine='compiled', prune_material=False):
+    """Every (stage, rule label) the pipeline can report, to spot dead rules."""
+    def table(mappings):
+        return [f"{pattern} -> {replacement}" for pattern, replacement in mappings.items()]
+
+    if engine == 'compiled':
+        inventory = [('rewrite_icons', label(rule)) for rule in COMPILED_RULES.rules]
+        inventory += [
+            ('remove_box_shadows', 'remove boxShadow'),
+            ('add_lucide_import', 'add lucide import'),
+        ]
+        if prune_material:
+            inventory.append(('prune_material_import', 'remove material import'))
+        inventory.append(('restore_const', 'restore const'))
+        return inventory
+
+    inventory = [('replace_icons', rule) for rule in table(replace_icons.ICON_MAPPINGS)]
+    inventory += [
+        ('remove_box_shadows', 'remove boxShadow'),
+        ('add_lucide_import', 'add lucide import'),
+    ]
+    inventory += [
+        ('cleanup_remaining', rule)
+        for rule in ['remove boxShadow', 'add lucide import']
+        + table(cleanup_remaining.REMAINING_ICON_MAPPINGS)
+    ]
+    inventory += [
+        ('fix_lucide_names', rule)
+        for rule in ['LucideLucideIcons -> LucideIcons']
+        + [f"{old} -> {new}" for old, new in fix_lucide_icons.ICON_MAPPINGS.items()]
+    ]
+    inventory += [
+        ('strip_icon_const', 'strip const Icon'),
+        ('strip_icon_const', 'strip const GradientIcon'),
+    ]
+    inventory += [
+        ('final_cleanup', f"{pattern} -> {replacement}")
+        for pattern, replacement in final_cleanup.FINAL_FIXES
+    ]
+    return inventory
+
+def rewrite(path, content, engine='compiled', prune_material=False):
+    """Rewrite hook for --dry-run/--diff: returns (content, per-match rule labels)."""
+    content, context = pipeline_for(engine, prune_material).run(path, content)
+    return content, context.fired
+
+def process_file(file_path, engine='compiled', write=True, prune_material=False):
+    """Run the whole pipeline on a single Dart file."""
+    return pipeline_for(engine, prune_material).process_file(file_path, write)
+
+def main():
+    """Run the migration pipeline over lib/."""
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_jobs_argument(parser)
+    add_cache_argument(parser)
+    add_preview_arguments(parser)
+    add_report_arguments(parser)
+    add_prefilter_argument(parser)
+    add_changes_arguments(parser)
+    add_rollback_argument(parser)
+    add_walk_arguments(parser)
+    parser.add_argument('--engine', choices=sorted(PIPELINES), default='compiled',
+                        help='icon rewrite engine (default: compiled)')
+    parser.add_argument('--prune-material', action='store_true',
+                        help='remove the material.dart import from files that no longer '
+                             'use it (compiled engine only)')
+    args = parser.parse_args()
+
+    if args.prune_material and args.engine != 'compiled':
+        parser.error('--prune-material needs the compiled engine')
+
+    if args.rollback:
+        if not run_rollback(PROJECT_ROOT):
+            sys.exit(1)
+        return
+
+    lib_dir = PROJECT_ROOT / 'lib'
+    pipeline = pipeline_for(args.engine, args.prune_material)
+    pipeline.use_prefilter = args.use_prefilter
+    source_filter = SourceFilter.from_args(args)
+
+    try:
+        candidates = selected_dart_files(args, lib_dir, source_filter)
+    except GitError as e:
+        parser.error(f"cannot list changed files: {e}")
+
+    if args.dry_run or args.diff:
+        preview_files(partial(rewrite, engine=args.engine,
+                              prune_material=args.prune_material),
+                      (path for path in candidates if pipeline.needs(path)),
+                      args.jobs, args.diff)
+        return
+
+    cache = RunCache.for_tool(PROJECT_ROOT, 'migrate',
+                              pipeline_fingerprint(args.engine, args.prune_material),
+                              args.use_cache)
+    # The full walk is lazy, so files the cache clears are never sniffed
+    source_filter.cleared = cache.is_unchanged
+    dart_files = (
+        path for path in candidates
+        if not cache.is_current(path) and pipeline.needs(path)
+    )
+    report = RunReport(rule_inventory(args.engine, args.prune_material))
+
+    modified_count = 0
+
+    # Workers only compute the new content; files are written here, in
+    # journaled batches, and recorded in the cache once they are on disk
+    writer = WriteBack.for_root(PROJECT_ROOT, on_written=cache.record)
+    try:
+        with profiled(args.profile), writer:
+            for dart_file, context in map_files(
+                    partial(process_file, engine=args.engine, write=False,
+                            prune_material=args.prune_material),
+                    dart_files, args.jobs):
+                if context.output is not None:
+                    writer.write(dart_file, context.output)
+                    context.output = None
+                elif context.error is None:
+                    # A failed file is retried on the next run
+                    cache.record(dart_file)
+                report.add(context)
+
+                if context.modified:
+                    modified_count += 1
+                    print(f"✓ {context.path}")
+                    print(f"  stages: {', '.join(context.applied)}")
+    finally:
+        cache.save()
+
+    if args.report:
+        report.write(args.report)
+
+    print()
+    prefiltered, prefilter_summary = pipeline.prefilter_summary()
+    print(f"Found {len(report.files) + cache.skipped + prefiltered} Dart files "
+          f"({cache.skipped} unchanged since last run, {prefilter_summary}; "
+          f"{source_filter.summary()})")
+    print(f"Modified {modified_count} files")
+    if writer.written:
+        print("Undo with --rollback")
+
+if __name__ == '__main__':
+    main()
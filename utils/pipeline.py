@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Rule pipeline engine: run ordered rewrite stages on one in-memory buffer.
+
+A stage is a function ``(content, context) -> content``. Stages can be scoped
+to a set of paths (relative to the project root) and can leave notes on the
+shared FileContext for later stages, e.g. the icon replacements that decide
+whether the Lucide import has to be added. Each file is read once and written
+at most once, after every stage has run.
+
+Stages append one rule label per rewritten match to ``context.fired``; the
+pipeline attributes those to the stage and also records the wall time and
+bytes scanned of every stage, for the run report in instrument.py.
+
+A stage may declare trigger patterns (see prefilter.py). A stage only changes
+a buffer when its trigger is present, and the buffer only changes through
+stages, so a file matching none of the triggers of its applicable stages can
+be skipped without reading it.
+"""
+
+import os
+import time
+from collections import Counter
+from pathlib import PurePath
+
+from prefilter import Prefilter
+from write_back import atomic_write
+
+class FileContext:
+    """Per-file state shared by the stages of one pipeline run."""
+
+    def __init__(self, path):
+        self.path = path
+        self.applied = []
+        self.replacements = []
+        self.fired = []
+        self.modified = False
+        self.output = None
+        self.error = None
+        self.bytes = 0
+        self.seconds = 0.0
+        self.stage_seconds = {}
+        self.stage_bytes = {}
+        self.rule_hits = {}
+
+class Stage:
+    """A named rewrite step, optionally limited to specific files."""
+
+    def __init__(self, name, func, paths=None, triggers=None):
+        self.name = name
+        self.func = func
+        self.paths = frozenset(paths) if paths is not None else None
+        self.triggers = list(triggers) if triggers is not None else None
+
+    def applies_to(self, path):
+        return self.paths is None or path in self.paths
+
+class Pipeline:
+    """Ordered list of stages applied to Dart files under a project root."""
+
+    def __init__(self, root='.'):
+        self.root = root
+        self.stages = []
+        self.use_prefilter = True
+        self._prefilters = {}
+
+    def add_stage(self, name, func, paths=None, triggers=None):
+        """Append a stage; names must be unique."""
+        if any(stage.name == name for stage in self.stages):
+            raise ValueError(f"Duplicate pipeline stage: {name}")
+        self.stages.append(Stage(name, func, paths, triggers))
+        self._prefilters.clear()
+
+    def stage(self, name, paths=None, triggers=None):
+        """Decorator form of add_stage."""
+        def register(func):
+            self.add_stage(name, func, paths, triggers)
+            return func
+        return register
+
+    def needs(self, path):
+        """False if no applicable stage can change path (trigger prefilter)."""
+        if not self.use_prefilter:
+            return True
+
+        relative = self.relative_path(path)
+        stages = tuple(stage.name for stage in self.stages if stage.applies_to(relative))
+        if stages not in self._prefilters:
+            applicable = [stage for stage in self.stages if stage.name in stages]
+            if any(stage.triggers is None for stage in applicable):
+                self._prefilters[stages] = None
+            else:
+                self._prefilters[stages] = Prefilter(
+                    [trigger for stage in applicable for trigger in stage.triggers]
+                )
+
+        prefilter = self._prefilters[stages]
+        return prefilter is None or prefilter.matches(path)
+
+    def prefilter_summary(self):
+        """Files and bytes skipped by needs() so far."""
+        prefilters = [prefilter for prefilter in self._prefilters.values() if prefilter]
+        files = sum(prefilter.skipped_files for prefilter in prefilters)
+        size = sum(prefilter.skipped_bytes for prefilter in prefilters)
+        return files, f"{files} files ({size / 1e6:.2f} MB) skipped by the prefilter"
+
+    def relative_path(self, path):
+        """Path of a file relative to the project root, in posix form."""
+        return PurePath(os.path.relpath(path, self.root)).as_posix()
+
+    def run(self, path, content, context=None):
+        """Run every applicable stage on content; returns (content, context)."""
+        if context is None:
+            context = FileContext(self.relative_path(path))
+        started = time.perf_counter()
+        for stage in self.stages:
+            if not stage.applies_to(context.path):
+                continue
+            fired_before = len(context.fired)
+            stage_started = time.perf_counter()
+            updated = stage.func(content, context)
+            context.stage_seconds[stage.name] = time.perf_counter() - stage_started
+            context.stage_bytes[stage.name] = len(content)
+            if len(context.fired) > fired_before:
+                context.rule_hits[stage.name] = Counter(context.fired[fired_before:])
+            if updated != content:
+                context.applied.append(stage.name)
+                content = updated
+        context.seconds = time.perf_counter() - started
+        return content, context
+
+    def process_file(self, path, write=True):
+        """
+        Read a file, run the pipeline and write the result back if it changed.
+
+        Returns the FileContext; ``context.modified`` tells whether the file
+        changed and ``context.error`` holds the message of a failure. With
+        ``write=False`` the new content is left in ``context.output`` for a
+        WriteBack in the parent process (see write_back.py) instead.
+        """
+        context = FileContext(self.relative_path(path))
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                original = f.read()
+            context.bytes = len(original)
+
+            content, _ = self.run(path, original, context)
+
+            if content != original:
+                if write:
+                    atomic_write(path, content)
+                else:
+                    context.output = content
+                context.modified = True
+
+        except Exception as e:
+            print(f"Error processing {path}: {e}")
+            context.error = str(e)
+
+        return context
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Byte-level prefilter: skip files that contain none of a tool's trigger tokens.
+
+Each codemod declares the trigger patterns its rules need (the combined icon
+matcher, ``boxShadow``, ``LucideLucideIcons``, ...). They are compiled into a
+single bytes regex and searched in a read-only memory map of each file, so a
+file that cannot match any rule is never decoded or handed to the rule engine.
+Triggers are necessary conditions for a rule to fire, so skipping is exact.
+"""
+
+import mmap
+import os
+import re
+
+def add_prefilter_argument(parser):
+    """Register the --no-prefilter option on an argparse parser."""
+    parser.add_argument(
+        '--no-prefilter',
+        dest='use_prefilter',
+        action='store_false',
+        help='decode and process every file, even without any trigger token',
+    )
+
+def compile_triggers(sources):
+    """Compile regex sources (str, ASCII) into one bytes pattern."""
+    return re.compile('|'.join(f'(?:{source})' for source in sources).encode('ascii'))
+
+class Prefilter:
+    """Multi-pattern trigger search over memory-mapped files."""
+
+    def __init__(self, sources, enabled=True):
+        self.pattern = compile_triggers(sources)
+        self.enabled = enabled
+        self.skipped_files = 0
+        self.skipped_bytes = 0
+
+    def matches(self, path):
+        """True if path contains a trigger (or cannot be checked)."""
+        if not self.enabled:
+            return True
+
+        try:
+            size = os.stat(path).st_size
+            if size == 0:
+                found = False
+            else:
+                with open(path, 'rb') as f:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                        found = self.pattern.search(view) is not None
+        except (OSError, ValueError):
+            # Let the tool itself report unreadable files
+            return True
+
+        if not found:
+            self.skipped_files += 1
+            self.skipped_bytes += size
+        return found
+
+    def filter(self, paths):
+        """Yield only the paths that contain a trigger."""
+        for path in paths:
+            if self.matches(path):
+                yield path
+
+    def summary(self):
+        """One-line description of what was skipped."""
+        return (f"{self.skipped_files} files ({self.skipped_bytes / 1e6:.2f} MB) "
+                f"skipped by the prefilter")
@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""
+Rule-table compiler for the Material -> Lucide icon mappings.
+
+The mapping tables were written to be applied one regex at a time, without
+word boundaries, in table order and across several scripts. That is what
+produces ``LucideIcons.edit_outlined`` (``Icons\\.edit`` matching a prefix),
+``LucideLucideIcons.mapPin`` (``Icons\\.map`` matching inside its own output)
+and the repair tables in fix_lucide_icons.py and final_cleanup.py.
+
+The compiler expands every rule into the concrete icon names it matches
+(``Icons\\.check(_circle)?`` -> check, check_circle), reports rules that the
+sequential order shadows or makes unreachable, rules that collide with a
+longer name on a prefix and targets that the tables rewrite again, and then
+emits one conflict-free matcher: each ``Icons.<name>`` identifier is matched
+whole, longest name first, and mapped straight to its final Lucide name.
+
+For every name the most specific rule wins: the one with the longest
+mandatory part (``check_circle`` beats ``check(_circle)?``), then the
+earliest in pass order. Repair mappings are folded into the targets, so no
+fixup pass is needed after the compiled rewrite.
+
+The tables are the rule packs under utils/rules/ (see rule_packs.py). The
+compiled table is cached under .codemod_cache/rule_packs/, keyed by the
+content hash of the packs, so a cold start skips expansion and analysis.
+
+Examples:
+    python3 utils/rule_compiler.py
+    python3 utils/rule_compiler.py --json conflicts.json --fail-on-conflicts
+    python3 utils/rule_compiler.py --pack replace_icons --pack final_cleanup
+"""
+
+import argparse
+import glob
+import json
+import os
+import re
+import sys
+from collections import namedtuple
+from pathlib import Path
+
+from icon_rewriter import RULE_SOURCE, RULE_TARGET
+from rule_packs import load_pack, packs_digest
+from run_cache import CACHE_DIR, add_cache_argument
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+PREFIX = 'Icons.'
+LUCIDE_PREFIX = 'LucideIcons.'
+
+# Pattern packs in pass order, and the rename pack folded into the targets
+DEFAULT_PACKS = ('replace_icons', 'cleanup_remaining', 'final_cleanup')
+REPAIR_PACK = 'fix_lucide_icons'
+
+# Bump when a change to the compiler alters the cached table for the same packs
+COMPILER_VERSION = 2
+
+# pattern is None for rules restored from the cache, which are never matched
+Rule = namedtuple('Rule', 'table source replacement names required pattern')
+Finding = namedtuple('Finding', 'kind rule other names detail')
+
+def expand_source(source):
+    """
+    Every icon name a rule source matches in full, and its mandatory length.
+
+    Sources are ``Icons\\.`` followed by literals and ``(a|b)`` or ``(a)?``
+    groups, the only forms RULE_SOURCE accepts.
+    """
+    body = source[len(r'Icons\.'):]
+    names = ['']
+    required = 0
+    position = 0
+    while position < len(body):
+        char = body[position]
+        if char != '(':
+            names = [name + char for name in names]
+            required += 1
+            position += 1
+            continue
+
+        close = body.index(')', position)
+        alternatives = body[position + 1:close].split('|')
+        optional = body[close + 1:close + 2] == '?'
+        position = close + (2 if optional else 1)
+        if optional:
+            alternatives.append('')
+        else:
+            required += min(len(alternative) for alternative in alternatives)
+        names = [name + alternative for name in names for alternative in alternatives]
+
+    return frozenset(names), required
+
+def load_rules(tables):
+    """Rules of the (table name, [(source, replacement)]) tables, in pass order."""
+    rules = []
+    for table, mappings in tables:
+        for source, replacement in mappings:
+            if not RULE_SOURCE.fullmatch(source) or not RULE_TARGET.fullmatch(replacement):
+                continue
+            names, required = expand_source(source)
+            rules.append(Rule(table, source, replacement, names, required, re.compile(source)))
+    return rules
+
+def default_tables(packs=DEFAULT_PACKS):
+    """The mapping tables of the migration scripts, in the order they run."""
+    return [(name, load_pack(name).rules) for name in packs]
+
+def default_repairs(pack=REPAIR_PACK):
+    """Bad Lucide name -> good name, from the fix_lucide_icons repair pass."""
+    return load_pack(pack).mappings()
+
+def label(rule):
+    return f"{rule.source} -> {rule.replacement}"
+
+def repaired(target, repairs):
+    """Apply the repair table to a LucideIcons.<name> target."""
+    if target.startswith(LUCIDE_PREFIX):
+        name = target[len(LUCIDE_PREFIX):]
+        return LUCIDE_PREFIX + repairs.get(name, name)
+    return target
+
+def repair_aliases(rules, repairs, exact):
+    """
+    Icon names that only reached a good name through a repair mapping.
+
+    ``Icons.edit_outlined`` became ``LucideIcons.edit_outlined`` through the
+    ``Icons\\.edit`` prefix match and was then repaired to ``edit``; the
+    compiled table maps such names directly. Names with a rule of their own
+    are left to that rule.
+    """
+    aliases = {}
+    for bad, good in repairs.items():
+        for rule in rules:
+            target = rule.replacement[len(LUCIDE_PREFIX):]
+            if not rule.replacement.startswith(LUCIDE_PREFIX) or not bad.startswith(target):
+                continue
+            suffix = bad[len(target):]
+            if not suffix.startswith('_'):
+                continue
+            for name in rule.names:
+                alias = name + suffix
+                # Only names the rule really matched up to the suffix
+                match = rule.pattern.match(PREFIX + alias)
+                if match is None or match.end() != len(PREFIX + name):
+                    continue
+                if alias not in exact and alias not in aliases:
+                    aliases[alias] = (LUCIDE_PREFIX + good, rule)
+    return aliases
+
+def analyze(rules, repairs, universe):
+    """Shadowed, unreachable, prefix-colliding, cascading and repaired rules."""
+    findings = []
+
+    # Sequential semantics: the first rule whose pattern matches at the start
+    # of a name rewrites it, and later rules never see that name
+    for position, rule in enumerate(rules):
+        shadowed = {}
+        for name in sorted(rule.names):
+            for earlier in rules[:position]:
+                if earlier.pattern.match(PREFIX + name):
+                    shadowed.setdefault(earlier, []).append(name)
+                    break
+        if sum(len(names) for names in shadowed.values()) == len(rule.names):
+            findings.append(Finding('unreachable', label(rule),
+                                    ', '.join(label(earlier) for earlier in shadowed),
+                                    sorted(rule.names),
+                                    "every name is rewritten by an earlier rule first"))
+            continue
+        for earlier, names in shadowed.items():
+            findings.append(Finding('shadowed', label(rule), label(earlier), names,
+                                    f"{len(names)} of {len(rule.names)} names are "
+                                    f"rewritten by an earlier rule first"))
+
+    for rule in rules:
+        collisions = []
+        for name in sorted(universe):
+            match = rule.pattern.match(PREFIX + name)
+            if match and match.end() < len(PREFIX + name):
+                collisions.append(name)
+        if collisions:
+            findings.append(Finding('prefix-collision', label(rule), None, collisions,
+                                    "matches only a prefix of these names (no word boundary)"))
+
+    for position, rule in enumerate(rules):
+        # Later rules in the same run, or the rule itself when a script is re-run
+        again = [other for other in rules[position:] if other.pattern.search(rule.replacement)]
+        if again:
+            findings.append(Finding('cascade', label(rule), None,
+                                    [other.source for other in again],
+                                    f"{rule.replacement} is matched again by"))
+
+    for rule in rules:
+        target = repaired(rule.replacement, repairs)
+        if target != rule.replacement:
+            findings.append(Finding('repaired-target', label(rule), None, [target],
+                                    "the target is an invalid name fixed by a repair pass"))
+
+    return findings
+
+class CompiledRules:
+    """Whole-identifier, longest-name-first matcher with final Lucide targets."""
+
+    def __init__(self, tables=None, repairs=None, state=None):
+        if state is not None:
+            # Restored from the cache: no expansion, analysis or per-rule
+            # re.compile, only the matcher itself
+            self.rules = [
+                Rule(table, source, replacement, frozenset(names), required, None)
+                for table, source, replacement, names, required in state['rules']
+            ]
+            self.targets = {
+                name: (target, self.rules[index])
+                for name, (target, index) in state['targets'].items()
+            }
+            self.findings = [Finding(**finding) for finding in state['findings']]
+            self.matcher = re.compile(state['pattern'])
+            return
+
+        tables = default_tables() if tables is None else tables
+        self.rules = load_rules(tables)
+        repairs = default_repairs() if repairs is None else repairs
+        self.targets = {}
+        ranked = sorted(enumerate(self.rules), key=lambda item: (-item[1].required, item[0]))
+        for _, rule in ranked:
+            for name in rule.names:
+                if name not in self.targets:
+                    self.targets[name] = (repaired(rule.replacement, repairs), rule)
+        self.targets.update(repair_aliases(self.rules, repairs, self.targets))
+
+        self.findings = analyze(self.rules, repairs, set(self.targets))
+
+        names = sorted(self.targets, key=lambda name: (-len(name), name))
+        self.matcher = re.compile(
+            r'(?<![A-Za-z0-9_$])Icons\.(' + '|'.join(names) + r')(?![A-Za-z0-9_$])'
+        )
+
+    @classmethod
+    def load(cls, packs=DEFAULT_PACKS, repair_pack=REPAIR_PACK, root=PROJECT_ROOT,
+             use_cache=True):
+        """
+        Compile rule packs by name, through the on-disk cache.
+
+        The cache file is keyed by the content hash of every pack, so editing
+        a pack recompiles it on the next start; the stale file of the same
+        pack set is removed.
+        Python cannot serialize a compiled regex, so what is cached is the
+        resolved table, the rule metadata and the matcher source, leaving
+        one re.compile.
+        """
+        loaded = [load_pack(name) for name in packs]
+        repairs = load_pack(repair_pack)
+        tables = [(pack.name, pack.rules) for pack in loaded]
+        digest = packs_digest(loaded + [repairs], COMPILER_VERSION)
+        cache_dir = Path(root) / CACHE_DIR / 'rule_packs'
+        stem = '+'.join(packs)
+        cache_path = cache_dir / f'{stem}-{digest[:16]}.json'
+
+        if use_cache:
+            try:
+                with open(cache_path, 'r', encoding='utf-8') as f:
+                    return cls(state=json.load(f))
+            except (OSError, ValueError, KeyError, TypeError, IndexError):
+                pass
+
+        compiled = cls(tables, repairs.mappings())
+        if not use_cache:
+            return compiled
+
+        # Another run (a hook, watch mode) may be writing the same cache: each
+        # process writes its own temp file, and a file already gone is fine
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        for stale in cache_dir.glob(f'{glob.escape(stem)}-*.json'):
+            if stale != cache_path:
+                stale.unlink(missing_ok=True)
+        index = {rule: position for position, rule in enumerate(compiled.rules)}
+        temp_path = cache_path.with_name(f'.{cache_path.name}.{os.getpid()}.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'rules': [
+                    [rule.table, rule.source, rule.replacement, sorted(rule.names), rule.required]
+                    for rule in compiled.rules
+                ],
+                'targets': {
+                    name: [target, index[rule]]
+                    for name, (target, rule) in compiled.targets.items()
+                },
+                'findings': [finding._asdict() for finding in compiled.findings],
+                'pattern': compiled.matcher.pattern,
+            }, f)
+        os.replace(temp_path, cache_path)
+        return compiled
+
+    def rewrite(self, content):
+        """
+        Rewrite content in one scan.
+
+        Returns the new content and ``(pattern, replacement, count)`` for
+        every rule that fired, in pass order.
+        """
+        counts = {}
+
+        def substitute(match):
+            target, rule = self.targets[match.group(1)]
+            counts[rule] = counts.get(rule, 0) + 1
+            return target
+
+        content = self.matcher.sub(substitute, content)
+        fired = [
+            (rule.source, rule.replacement, counts[rule])
+            for rule in self.rules if rule in counts
+        ]
+        return content, fired
+
+    def conflicts(self):
+        """Findings grouped by kind."""
+        grouped = {}
+        for finding in self.findings:
+            grouped.setdefault(finding.kind, []).append(finding)
+        return grouped
+
+def print_report(compiled):
+    """Human-readable conflict report."""
+    grouped = compiled.conflicts()
+    for kind in ('unreachable', 'shadowed', 'prefix-collision', 'cascade', 'repaired-target'):
+        findings = grouped.get(kind, [])
+        print(f"=== {kind} ({len(findings)}) ===")
+        for finding in findings:
+            other = f"  [by {finding.other}]" if finding.other else ""
+            print(f"  {finding.rule}{other}")
+            print(f"      {finding.detail}: {', '.join(finding.names)}")
+        print()
+
+    print(f"Compiled {len(compiled.rules)} rules into {len(compiled.targets)} icon names")
+
+def main():
+    """Compile the mapping tables and report conflicts."""
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--json', metavar='PATH',
+                        help='also write the findings and compiled table as JSON')
+    parser.add_argument('--fail-on-conflicts', action='store_true',
+                        help='exit with status 1 if any rule is shadowed or unreachable')
+    parser.add_argument('--pack', action='append', metavar='NAME',
+                        help='pattern pack to compile, in pass order (repeatable; '
+                             f"default: {' '.join(DEFAULT_PACKS)})")
+    add_cache_argument(parser)
+    args = parser.parse_args()
+
+    compiled = CompiledRules.load(tuple(args.pack or DEFAULT_PACKS), use_cache=args.use_cache)
+    print_report(compiled)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({
+                'findings': [finding._asdict() for finding in compiled.findings],
+                'table': {
+                    name: {'target': target, 'rule': label(rule)}
+                    for name, (target, rule) in sorted(compiled.targets.items())
+                },
+            }, f, indent=2)
+
+    grouped = compiled.conflicts()
+    if args.fail_on_conflicts and (grouped.get('shadowed') or grouped.get('unreachable')):
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
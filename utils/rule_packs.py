@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Versioned rule packs: the icon mapping tables as data under utils/rules/.
+
+Each pack is a JSON file with a name, a version, a kind and its rules in
+named groups, applied in file order:
+
+- ``pattern`` packs map a regex source (``Icons\\.home``) to a replacement
+- ``rename`` packs map an incorrect LucideIcons name to the correct one
+
+Packs are loaded by name (``replace_icons``) or by path, and each carries
+the sha256 of its file, which keys the compiled-matcher cache of
+rule_compiler.py and the run caches of the scripts using it.
+
+Examples:
+    python3 utils/rule_packs.py
+    python3 utils/rule_packs.py --show final_cleanup
+"""
+
+import argparse
+import hashlib
+import json
+from pathlib import Path
+
+RULES_DIR = Path(__file__).resolve().parent / 'rules'
+
+KINDS = ('pattern', 'rename')
+
+class RulePackError(ValueError):
+    """Raised when a rule pack cannot be found or is malformed."""
+
+class RulePack:
+    """An ordered list of (source, replacement) rules loaded from a pack file."""
+
+    def __init__(self, name, version, kind, description, groups, digest):
+        self.name = name
+        self.version = version
+        self.kind = kind
+        self.description = description
+        self.groups = groups
+        self.digest = digest
+        self.rules = [tuple(rule) for _, rules in groups for rule in rules]
+
+    def mappings(self):
+        """The rules as an ordered {source: replacement} dict."""
+        return dict(self.rules)
+
+_LOADED = {}
+
+def pack_path(name, rules_dir=RULES_DIR):
+    """File of a pack given by name or by path."""
+    if name.endswith('.json'):
+        return Path(name)
+    return Path(rules_dir) / f'{name}.json'
+
+def available_packs(rules_dir=RULES_DIR):
+    """Names of the packs under rules_dir, sorted."""
+    return sorted(path.stem for path in Path(rules_dir).glob('*.json'))
+
+def load_pack(name, rules_dir=RULES_DIR):
+    """Load and validate a pack; each file is read once per process."""
+    path = pack_path(name, rules_dir).resolve()
+    if path in _LOADED:
+        return _LOADED[path]
+
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except OSError as e:
+        raise RulePackError(f"rule pack {name}: {e}") from e
+    try:
+        spec = json.loads(data)
+    except ValueError as e:
+        raise RulePackError(f"rule pack {name}: invalid JSON: {e}") from e
+
+    if spec.get('kind') not in KINDS:
+        raise RulePackError(f"rule pack {name}: kind must be one of {', '.join(KINDS)}")
+    groups = []
+    for group in spec.get('groups', []):
+        rules = group.get('rules', [])
+        for rule in rules:
+            if (not isinstance(rule, list) or len(rule) != 2
+                    or not all(isinstance(part, str) for part in rule)):
+                raise RulePackError(f"rule pack {name}: bad rule {rule!r}")
+        groups.append((group.get('name'), rules))
+
+    pack = RulePack(spec.get('name', path.stem), spec.get('version', 1), spec['kind'],
+                    spec.get('description', ''), groups, hashlib.sha256(data).hexdigest())
+    _LOADED[path] = pack
+    return pack
+
+def packs_digest(packs, *extra):
+    """Content hash of a set of packs (and any extra key parts), in order."""
+    payload = json.dumps([pack.digest for pack in packs] + list(extra))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def main():
+    """List the available packs, or print the rules of one."""
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--show', metavar='PACK',
+                        help='print the rules of a pack, by group')
+    args = parser.parse_args()
+
+    if args.show:
+        pack = load_pack(args.show)
+        print(f"{pack.name} v{pack.version} ({pack.kind}): {pack.description}")
+        for group, rules in pack.groups:
+            print(f"\n# {group}" if group else "")
+            for source, replacement in rules:
+                print(f"{source} -> {replacement}")
+        return
+
+    for name in available_packs():
+        pack = load_pack(name)
+        print(f"{name:20s} v{pack.version}  {pack.kind:8s} {len(pack.rules):4d} rules  "
+              f"{pack.digest[:12]}  {pack.description}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Incremental run cache for the codemod scripts.
+
+Each tool keeps a manifest of the files it has already handled: path, size,
+mtime and content hash, plus a fingerprint of the rule tables it ran with.
+A later run skips a file whose size and mtime are unchanged with a single
+stat() call, and falls back to comparing the content hash when only the
+mtime moved. Changing any rule table invalidates the whole manifest.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+CACHE_DIR = '.codemod_cache'
+
+# Bump when a change to the engine alters output for the same rule tables
+CACHE_VERSION = 2
+
+def add_cache_argument(parser):
+    """Register the --no-cache option on an argparse parser."""
+    parser.add_argument(
+        '--no-cache',
+        dest='use_cache',
+        action='store_false',
+        help='process every file even if the previous run already handled it',
+    )
+
+def rules_fingerprint(*tables):
+    """Fingerprint one or more rule tables (dicts or lists of pairs)."""
+    payload = json.dumps(
+        [CACHE_VERSION] + [list(dict(table).items()) for table in tables],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def file_digest(path):
+    """Hash the content of a file."""
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+class RunCache:
+    """Per-tool manifest of files that are up to date with the rule tables."""
+
+    def __init__(self, manifest_path, fingerprint, enabled=True):
+        self.manifest_path = Path(manifest_path)
+        self.fingerprint = fingerprint
+        self.enabled = enabled
+        self.entries = {}
+        self.skipped = 0
+        self._dirty = False
+
+        if enabled:
+            self._load()
+
+    @classmethod
+    def for_tool(cls, root, tool, fingerprint, enabled=True):
+        """Open the manifest for a tool under <root>/.codemod_cache/."""
+        return cls(Path(root) / CACHE_DIR / f'{tool}.json', fingerprint, enabled)
+
+    def _load(self):
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        if manifest.get('fingerprint') == self.fingerprint:
+            self.entries = manifest.get('files', {})
+
+    def is_current(self, path):
+        """Return True if path is unchanged since it was last recorded."""
+        if not self.is_unchanged(path):
+            return False
+        self.skipped += 1
+        return True
+
+    def is_unchanged(self, path):
+        """is_current() without counting path as skipped."""
+        if not self.enabled:
+            return False
+
+        entry = self.entries.get(str(path))
+        if entry is None:
+            return False
+
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+
+        if stat.st_size != entry['size']:
+            return False
+
+        if stat.st_mtime_ns != entry['mtime_ns']:
+            # Touched but possibly not edited: compare content before giving up
+            if file_digest(path) != entry['sha256']:
+                return False
+            entry['mtime_ns'] = stat.st_mtime_ns
+            self._dirty = True
+
+        return True
+
+    def record(self, path):
+        """Store the current state of path as handled."""
+        if not self.enabled:
+            return
+
+        try:
+            stat = os.stat(path)
+            digest = file_digest(path)
+        except OSError:
+            self.entries.pop(str(path), None)
+            return
+
+        self.entries[str(path)] = {
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'sha256': digest,
+        }
+        self._dirty = True
+
+    def save(self):
+        """Write the manifest back if anything changed."""
+        if not self.enabled or not self._dirty:
+            return
+
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.manifest_path.with_suffix('.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'fingerprint': self.fingerprint, 'files': self.entries}, f)
+        os.replace(temp_path, self.manifest_path)
+        self._dirty = False
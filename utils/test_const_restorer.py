@@ -0,0 +1,66 @@
+"""Tests for the const restoration pass of const_restorer.py."""
+
+import pytest
+
+from const_restorer import ConstTable, restore_const
+
+def restore(source, constants=()):
+    return restore_const(source, ConstTable(constants=constants))
+
+def test_hoists_const_to_the_outermost_call():
+    source = 'f() { return Row(children: [Icon(LucideIcons.x)]); }'
+    assert restore(source) == ('f() { return const Row(children: [Icon(LucideIcons.x)]); }', 2)
+
+def test_drops_const_made_redundant():
+    source = 'f() => Row(children: [const Icon(LucideIcons.x), const Text("a")]);'
+    assert restore(source) == ('f() => const Row(children: [Icon(LucideIcons.x), Text("a")]);', 1)
+
+def test_project_constants_and_negative_numbers():
+    source = 'f() => Padding(padding: EdgeInsets.all(-8.0), child: Icon(Icons.add, size: kSize));'
+    assert restore(source, constants=['kSize']) == (
+        'f() => const Padding(padding: EdgeInsets.all(-8.0), '
+        'child: Icon(Icons.add, size: kSize));', 3)
+
+@pytest.mark.parametrize('source', [
+    # Non-constant arguments
+    'f() => Text(name);',
+    "f() => Text('$name');",
+    'f() => Text(label());',
+    # Not a known const constructor
+    'f() => Foo(1);',
+    # Already in a const context
+    'const w = [Icon(LucideIcons.x)];',
+    'f() => const Row(children: [Icon(LucideIcons.x)]);',
+    # A declaration, not an expression
+    'class A { Icon(LucideIcons.x); }',
+])
+def test_leaves_non_constant_expressions(source):
+    assert restore(source) == (source, 0)
+
+@pytest.mark.parametrize('source', [
+    'const x = Icon(LucideIcons.home)',
+    'const',
+    'final a = const [Icon(LucideIcons.home',
+])
+def test_unfinished_buffers(source):
+    assert restore(source) == (source, 0)
+
+def test_fired_labels():
+    fired = []
+    restore_const('a = Icon(LucideIcons.x); b = Icon(LucideIcons.y);', ConstTable(), fired)
+    assert fired == ['restore const', 'restore const']
+
+def test_cached_project_table_follows_edits(tmp_path):
+    lib = tmp_path / 'lib'
+    lib.mkdir()
+    (lib / 'a.dart').write_text('const kGap = 8.0;\n')
+    (lib / 'b.dart').write_text('enum Tone { light, dark }\n')
+    cache_path = tmp_path / 'const_table.json'
+    table = ConstTable.for_project(lib, cache_path)
+    assert {'kGap'} <= table.constants and 'Tone' in table.namespaces
+
+    (lib / 'a.dart').write_text('const kSpacing = 8.0;\nfinal w = const Badge();\n')
+    (lib / 'b.dart').unlink()
+    table = ConstTable.for_project(lib, cache_path)
+    assert 'kSpacing' in table.constants and 'kGap' not in table.constants
+    assert 'Badge' in table.constructors and 'Tone' not in table.namespaces
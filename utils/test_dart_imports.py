@@ -0,0 +1,52 @@
+"""Tests for the import edits of dart_imports.py."""
+
+import pytest
+
+from dart_imports import (LUCIDE_IMPORT, MATERIAL_IMPORT, add_import, has_import,
+                          prune_material_import)
+
+HEADER = (
+    "import 'package:flutter/material.dart';\n"
+    "import 'package:lucide_icons/lucide_icons.dart';\n"
+    "\n"
+)
+
+def prune(body):
+    return prune_material_import(HEADER + body)
+
+@pytest.mark.parametrize('body', [
+    "final icon = LucideIcons.home;\n",
+    "class Foo {\n  @override\n  String toString() => 'Foo';\n}\n",
+    "String label(int count) => '$count items';\n",
+])
+def test_prunes_unused_material_import(body):
+    assert not has_import(prune(body), MATERIAL_IMPORT)
+
+@pytest.mark.parametrize('body', [
+    "final icon = Icon(LucideIcons.home, color: Colors.red);\n",
+    "@immutable\nclass Point {\n  const Point();\n}\n",
+    "class Base {\n  @protected\n  void paint() {}\n}\n",
+    "class Base {\n  @mustCallSuper\n  void dispose() {}\n}\n",
+    "bool same(List<int> a, List<int> b) => listEquals(a, b);\n",
+    "bool same(Map a, Map b) => mapEquals(a, b) && setEquals(a.keys.toSet(), {});\n",
+    "Future<int> run(int Function(int) h) => compute(h, 1);\n",
+    "String name(Object value) => describeEnum(value);\n",
+    "double? mix(double a, double b) => lerpDouble(a, b, 0.5);\n",
+    "void tap() => showDialog();\n",
+    "String height() => '${kToolbarHeight}';\n",
+    "String height() => 'height: $kToolbarHeight';\n",
+    "String label() => 'size: ${MediaQuery.of(context).size}';\n",
+])
+def test_keeps_material_import_when_used(body):
+    assert prune(body) == HEADER + body
+
+def test_part_file_gets_no_import():
+    source = "part of 'disputes_cubit.dart';\n\nfinal icon = LucideIcons.home;\n"
+    assert add_import(source, LUCIDE_IMPORT) == source
+
+def test_import_goes_after_library_directive():
+    source = "library settings;\n\npart 'settings_state.dart';\n"
+    assert add_import(source, LUCIDE_IMPORT) == (
+        "library settings;\n\n"
+        f"import '{LUCIDE_IMPORT}';\n\n"
+        "part 'settings_state.dart';\n")
@@ -0,0 +1,41 @@
+"""Tests for the named-argument remover of dart_lexer.py."""
+
+from dart_lexer import remove_named_argument
+
+def test_removes_middle_argument():
+    source = 'BoxDecoration(color: c, boxShadow: [BoxShadow(blurRadius: 4)], border: b)'
+    assert remove_named_argument(source, 'boxShadow') == (
+        'BoxDecoration(color: c, border: b)', 1)
+
+def test_removes_last_argument_with_its_comma():
+    source = 'BoxDecoration(color: c, boxShadow: shadows)'
+    assert remove_named_argument(source, 'boxShadow') == ('BoxDecoration(color: c)', 1)
+
+def test_removes_argument_line():
+    source = 'BoxDecoration(\n  color: c,\n  boxShadow: [\n    shadow,\n  ],\n)'
+    assert remove_named_argument(source, 'boxShadow') == ('BoxDecoration(\n  color: c,\n)', 1)
+
+def test_ignores_brackets_in_strings_and_comments():
+    source = "X(boxShadow: f(')', /* ] */ 1), label: 'boxShadow: 1')"
+    assert remove_named_argument(source, 'boxShadow') == ("X(label: 'boxShadow: 1')", 1)
+
+def test_type_arguments_do_not_end_the_value():
+    source = 'BoxDecoration(color: c, boxShadow: f<int, int>(1))'
+    assert remove_named_argument(source, 'boxShadow') == ('BoxDecoration(color: c)', 1)
+
+def test_nested_type_arguments():
+    source = 'X(boxShadow: m<String, List<int>>(), color: c)'
+    assert remove_named_argument(source, 'boxShadow') == ('X(color: c)', 1)
+
+def test_comparison_is_not_a_type_argument():
+    source = 'X(boxShadow: a < b, color: c > d ? e : f)'
+    assert remove_named_argument(source, 'boxShadow') == ('X(color: c > d ? e : f)', 1)
+
+def test_nested_argument_before_outer_one():
+    source = 'f(a: g(boxShadow: 1), boxShadow: 2)'
+    assert remove_named_argument(source, 'boxShadow') == ('f(a: g())', 2)
+
+def test_skips_raw_strings_and_map_keys():
+    source = "f(r'(', {boxShadow: 1}, boxShadow: 2, s: r\"boxShadow: 3\")"
+    assert remove_named_argument(source, 'boxShadow') == (
+        "f(r'(', {boxShadow: 1}, s: r\"boxShadow: 3\")", 1)
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Persistent inverted index of the icon and decoration tokens under lib/.
+
+One scan records where every ``Icons.<name>`` / ``LucideIcons.<name>``
+identifier and every ``boxShadow`` / ``elevation`` argument appears, as
+token -> {path: [byte offsets]}. The index is saved under .codemod_cache/;
+later runs rescan only the files whose size or mtime changed and drop the
+files that disappeared.
+
+Tokens are whole identifier chains (``LucideLucideIcons.mapPin`` is one
+token), so a rule whose matches always lie inside a single identifier - every
+icon rule does - can be dispatched with files_matching(): its pattern is
+tested against the few hundred distinct tokens instead of every file.
+
+Examples:
+    python3 utils/token_index.py
+    python3 utils/token_index.py --pattern 'Icons\\.edit'
+"""
+
+import argparse
+import json
+import os
+import re
+from pathlib import Path, PurePath
+
+from codemod_runner import SourceFilter, add_walk_arguments, iter_dart_files
+from run_cache import CACHE_DIR, add_cache_argument
+
+# Bump when TOKEN_PATTERN changes
+INDEX_VERSION = 1
+
+TOKEN_PATTERN = re.compile(
+    rb'(?<![A-Za-z0-9_$])[A-Za-z0-9_$]*'
+    rb'(?:Icons\.[A-Za-z0-9_]+|boxShadow[A-Za-z0-9_]*|elevation[A-Za-z0-9_]*)'
+)
+
+def scan_tokens(data):
+    """Map each token in data (bytes) to the byte offsets where it starts."""
+    tokens = {}
+    for match in TOKEN_PATTERN.finditer(data):
+        tokens.setdefault(match.group().decode('ascii'), []).append(match.start())
+    return tokens
+
+class TokenIndex:
+    """Token -> file -> offsets index of the Dart files under a project root."""
+
+    def __init__(self, root, index_path, enabled=True):
+        self.root = Path(root)
+        self.index_path = Path(index_path)
+        self.enabled = enabled
+        self.files = {}
+        self.postings = {}
+        self.scanned = 0
+        self.reused = 0
+        self._dirty = False
+
+        if enabled:
+            self._load()
+
+    @classmethod
+    def for_root(cls, root, enabled=True):
+        """Open the index under <root>/.codemod_cache/."""
+        return cls(root, Path(root) / CACHE_DIR / 'token_index.json', enabled)
+
+    def _load(self):
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        if saved.get('version') == INDEX_VERSION:
+            self.files = saved.get('files', {})
+            self.postings = saved.get('tokens', {})
+
+    def relative_path(self, path):
+        """Index key of a file: its path relative to the root, in posix form."""
+        return PurePath(os.path.relpath(path, self.root)).as_posix()
+
+    def _forget(self, key):
+        for token in self.files.pop(key)['tokens']:
+            paths = self.postings[token]
+            paths.pop(key, None)
+            if not paths:
+                del self.postings[token]
+
+    def is_fresh(self, path):
+        """True if path's entry matches its current size and mtime."""
+        entry = self.files.get(self.relative_path(path))
+        if entry is None:
+            return False
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+        return entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns
+
+    def update(self, lib_dir='lib', source_filter=None):
+        """
+        Bring the index up to date with lib_dir; returns self.
+
+        Files the source filter skips (generated or excluded) are dropped
+        from the index like deleted ones. A file with a fresh entry already
+        passed the filter, so it is not sniffed for the generated banner again.
+        """
+        source_filter = SourceFilter() if source_filter is None else source_filter
+        if source_filter.cleared is None:
+            source_filter.cleared = self.is_fresh
+        seen = set()
+        for path in iter_dart_files(self.root / lib_dir, source_filter):
+            key = self.relative_path(path)
+            seen.add(key)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+
+            entry = self.files.get(key)
+            if (entry is not None and entry['size'] == stat.st_size
+                    and entry['mtime_ns'] == stat.st_mtime_ns):
+                self.reused += 1
+                continue
+
+            try:
+                with open(path, 'rb') as f:
+                    tokens = scan_tokens(f.read())
+            except OSError:
+                continue
+
+            if entry is not None:
+                self._forget(key)
+            self.files[key] = {
+                'size': stat.st_size,
+                'mtime_ns': stat.st_mtime_ns,
+                'tokens': sorted(tokens),
+            }
+            for token, offsets in tokens.items():
+                self.postings.setdefault(token, {})[key] = offsets
+            self.scanned += 1
+            self._dirty = True
+
+        prefix = PurePath(self.relative_path(self.root / lib_dir)).as_posix() + '/'
+        for key in [key for key in self.files if key.startswith(prefix) and key not in seen]:
+            self._forget(key)
+            self._dirty = True
+
+        return self
+
+    def occurrences(self, token):
+        """{path: [byte offsets]} of one exact token."""
+        return {self.root / key: offsets for key, offsets in self.postings.get(token, {}).items()}
+
+    def tokens_matching(self, sources, anchored=False):
+        """
+        Tokens in which any of the regex sources has a match.
+
+        With anchored=True the match must start the token, so ``Icons\\.star``
+        finds ``Icons.star`` but not ``LucideIcons.star``.
+        """
+        finders = [re.compile(source).match if anchored else re.compile(source).search
+                   for source in sources]
+        return [token for token in self.postings
+                if any(find(token) for find in finders)]
+
+    def files_matching(self, sources):
+        """Files containing a token any of the regex sources matches, sorted."""
+        keys = set()
+        for token in self.tokens_matching(sources):
+            keys.update(self.postings[token])
+        return [self.root / key for key in sorted(keys)]
+
+    def dispatch(self, rules, anchored=False):
+        """
+        Map each file to the (pattern, replacement) rules its tokens can fire.
+
+        Rules keep their table order per file, and files come sorted.
+        anchored is passed on to tokens_matching().
+        """
+        by_key = {}
+        for rule in rules:
+            for token in self.tokens_matching([rule[0]], anchored):
+                for key in self.postings[token]:
+                    fixes = by_key.setdefault(key, [])
+                    if rule not in fixes:
+                        fixes.append(rule)
+        order = {rule: position for position, rule in enumerate(rules)}
+        return {
+            self.root / key: sorted(by_key[key], key=order.get)
+            for key in sorted(by_key)
+        }
+
+    def summary(self):
+        """One-line description of the last update."""
+        return (f"index: {len(self.files)} files, {len(self.postings)} tokens, "
+                f"{self.scanned} rescanned")
+
+    def save(self):
+        """Write the index back if anything changed."""
+        if not self.enabled or not self._dirty:
+            return
+
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.index_path.with_suffix('.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': INDEX_VERSION, 'files': self.files,
+                       'tokens': self.postings}, f)
+        os.replace(temp_path, self.index_path)
+        self._dirty = False
+
+def main():
+    """Update the index and print it, or look up a token or pattern."""
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('lib_dir', nargs='?', default='lib',
+                        help='directory to index (default: lib)')
+    parser.add_argument('--token', action='append', default=[],
+                        help='print the files and offsets of an exact token (repeatable)')
+    parser.add_argument('--pattern', action='append', default=[],
+                        help='print the files a rule pattern would be dispatched to (repeatable)')
+    add_cache_argument(parser)
+    add_walk_arguments(parser)
+    args = parser.parse_args()
+
+    source_filter = SourceFilter.from_args(args)
+    index = TokenIndex.for_root('.', args.use_cache).update(args.lib_dir, source_filter)
+    index.save()
+
+    for token in args.token:
+        print(f"=== {token} ===")
+        for path, offsets in sorted(index.occurrences(token).items()):
+            print(f"{path}: {', '.join(str(offset) for offset in offsets)}")
+
+    for source in args.pattern:
+        print(f"=== {source} ===")
+        for path in index.files_matching([source]):
+            print(path)
+
+    if not args.token and not args.pattern:
+        counts = sorted(((sum(len(offsets) for offsets in paths.values()), token)
+                         for token, paths in index.postings.items()), reverse=True)
+        for count, token in counts:
+            print(f"{count:6d}  {token}")
+
+    print(f"{index.summary()}; {source_filter.summary()}")
+
+if __name__ == '__main__':
+    main()
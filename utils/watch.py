@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Watch mode: re-apply the migration to Dart files as they are saved.
+
+A polling loop stats the files under lib/ (no reads, no file-system event
+library) and remembers their mtime and size. A changed file is processed
+once it has been quiet for the debounce interval, so an editor's burst of
+writes or a branch checkout is handled in one go; generated and excluded
+files are skipped as in every other tool. Each file is run through
+the migrate.py pipeline - built once at start-up, so the compiled rule set
+and const table stay in memory - and then audited for whatever the rules
+could not fix. The file written back is recorded so the watcher does not
+react to its own write. Writes go through one WriteBack for the whole
+session, so ``write_back.py --rollback`` undoes everything it changed.
+
+Examples:
+    python3 utils/watch.py
+    python3 utils/watch.py --engine legacy --debounce 200
+"""
+
+import argparse
+import os
+import time
+from functools import partial
+from pathlib import Path
+
+from audit import audit_content, is_valid_lucide_name
+from codemod_runner import SourceFilter, add_walk_arguments
+from const_restorer import project_table
+from lucide_names import LucideNames
+from migrate import PIPELINES, PROJECT_ROOT
+from write_back import WriteBack
+
+def snapshot(lib_dir):
+    """
+    {path: (mtime_ns, size)} of every Dart file under lib_dir.
+
+    Uses os.scandir directly rather than iter_dart_files: no sorting and no
+    Path objects, which keeps a poll of a few hundred files at a few ms.
+    """
+    stats = {}
+    directories = [str(lib_dir)]
+    while directories:
+        try:
+            entries = os.scandir(directories.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    directories.append(entry.path)
+                elif entry.name.endswith('.dart'):
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    stats[entry.path] = (stat.st_mtime_ns, stat.st_size)
+    return stats
+
+class Watcher:
+    """Stat-polling change detector with a per-file debounce."""
+
+    def __init__(self, lib_dir, debounce=0.03, source_filter=None):
+        self.lib_dir = Path(lib_dir)
+        self.debounce = debounce
+        self.source_filter = SourceFilter() if source_filter is None else source_filter
+        self.stats = snapshot(self.lib_dir)
+        self.pending = {}
+
+    def poll(self):
+        """Stat every file once; returns the paths that have settled."""
+        now = time.monotonic()
+        current = snapshot(self.lib_dir)
+        for path, stat in current.items():
+            if self.stats.get(path) != stat:
+                self.pending[path] = now
+        for path in list(self.pending):
+            if path not in current:
+                del self.pending[path]
+        self.stats = current
+
+        ready = sorted(path for path, changed in self.pending.items()
+                       if now - changed >= self.debounce)
+        for path in ready:
+            del self.pending[path]
+        return [
+            Path(path) for path in ready
+            if self.source_filter.accepts(path, os.path.relpath(path, self.lib_dir)
+                                          .replace(os.sep, '/'))
+        ]
+
+    def record(self, path):
+        """Remember a file's stat after writing it, so the write is not a change."""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return
+        self.stats[str(path)] = (stat.st_mtime_ns, stat.st_size)
+
+def report(path, context, findings, elapsed):
+    """One line per processed file, then its remaining findings."""
+    relative = path.relative_to(PROJECT_ROOT)
+    if context.error:
+        return
+    if context.modified:
+        print(f"✓ {relative} ({', '.join(context.applied)}) in {elapsed * 1000:.0f} ms")
+    else:
+        print(f"· {relative} unchanged in {elapsed * 1000:.0f} ms")
+    for finding in findings:
+        print(f"  {finding['location']}: {finding['category']} {finding['token']}")
+
+def main():
+    """Watch lib/ and migrate files on save until interrupted."""
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--engine', choices=sorted(PIPELINES), default='compiled',
+                        help='icon rewrite engine (default: compiled)')
+    parser.add_argument('--interval', type=float, default=25, metavar='MS',
+                        help='polling interval in milliseconds (default: 25)')
+    parser.add_argument('--debounce', type=float, default=30, metavar='MS',
+                        help='quiet time before a changed file is processed (default: 30)')
+    add_walk_arguments(parser)
+    args = parser.parse_args()
+
+    pipeline = PIPELINES[args.engine]
+    names = LucideNames.load(PROJECT_ROOT)
+    validator = partial(is_valid_lucide_name, names=names)
+    watcher = Watcher(PROJECT_ROOT / 'lib', args.debounce / 1000, SourceFilter.from_args(args))
+    if args.engine == 'compiled':
+        # Build the const table now rather than on the first save
+        project_table()
+
+    print(f"Watching {len(watcher.stats)} Dart files under lib/ (Ctrl+C to stop)")
+    writer = WriteBack.for_root(PROJECT_ROOT)
+    try:
+        while True:
+            for path in watcher.poll():
+                started = time.perf_counter()
+                context = pipeline.process_file(path, write=False)
+                if context.output is not None:
+                    writer.write(path, context.output)
+                    writer.flush()
+                    context.output = None
+                    watcher.record(path)
+                try:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        findings = list(audit_content(f.read(), path.relative_to(PROJECT_ROOT),
+                                                      validator))
+                except (OSError, UnicodeDecodeError):
+                    findings = []
+                report(path, context, findings, time.perf_counter() - started)
+            time.sleep(args.interval / 1000)
+    except KeyboardInterrupt:
+        print()
+    finally:
+        writer.close()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Atomic write-back with a rollback journal.
+
+Files are never rewritten in place: the new bytes go to a temporary file in
+the same directory, which is then renamed over the original, so an
+interrupted run leaves every file either untouched or fully rewritten.
+
+WriteBack collects changed buffers and writes them in batches, one
+directory at a time: the temporary files are written and synced, renamed,
+and then the directory is synced once for the whole batch. Before a batch
+is renamed into place, the original bytes of its files are appended
+(zlib-compressed) to a journal under .codemod_cache/, so ``--rollback``
+restores the last run exactly. A buffer identical to the file on disk is
+never written, which keeps mtimes and downstream build caches valid.
+
+Examples:
+    python3 utils/write_back.py --rollback
+    python3 utils/write_back.py --show
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import os
+import sys
+import zlib
+from pathlib import Path, PurePath
+
+from run_cache import CACHE_DIR
+
+JOURNAL_VERSION = 1
+
+def encode_text(content):
+    """Bytes a text-mode write of content would produce on this platform."""
+    if os.linesep != '\n':
+        content = content.replace('\n', os.linesep)
+    return content.encode('utf-8')
+
+def _sync_directory(directory):
+    """fsync a directory so renames in it are durable; a no-op where unsupported."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+def _write_temp(path, data):
+    """Write data next to path, synced, with path's permissions; returns the temp path."""
+    path = Path(path)
+    temp_path = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+    with open(temp_path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    try:
+        os.chmod(temp_path, os.stat(path).st_mode & 0o7777)
+    except OSError:
+        pass
+    return temp_path
+
+def atomic_write(path, content):
+    """
+    Replace a file's content through a temp file and rename (text, UTF-8).
+
+    Nothing is journaled; the tools themselves write through WriteBack so
+    that --rollback covers their last run.
+    """
+    data = content if isinstance(content, bytes) else encode_text(content)
+    os.replace(_write_temp(path, data), path)
+    _sync_directory(Path(path).parent)
+
+class WriteBack:
+    """Batched, journaled atomic writer for one run."""
+
+    def __init__(self, root, journal_path, batch_size=64, on_written=None):
+        self.root = Path(root)
+        self.journal_path = Path(journal_path)
+        self.batch_size = batch_size
+        self.on_written = on_written
+        self.pending = {}
+        self.written = 0
+        self.unchanged = 0
+        self._journal = None
+
+    @classmethod
+    def for_root(cls, root, **options):
+        """Writer journaling to <root>/.codemod_cache/journal.jsonl."""
+        return cls(root, Path(root) / CACHE_DIR / 'journal.jsonl', **options)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def relative_path(self, path):
+        return PurePath(os.path.relpath(path, self.root)).as_posix()
+
+    def write(self, path, content):
+        """Queue content for path; returns False if it matches the file on disk."""
+        data = encode_text(content)
+        with open(path, 'rb') as f:
+            original = f.read()
+        if data == original:
+            self.unchanged += 1
+            return False
+
+        self.pending.setdefault(Path(path).parent, []).append((Path(path), original, data))
+        if sum(len(files) for files in self.pending.values()) >= self.batch_size:
+            self.flush()
+        return True
+
+    def _open_journal(self):
+        # The journal covers the last run that wrote anything, so it is only
+        # replaced once this run has its first batch
+        if self._journal is None:
+            self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+            self._journal = open(self.journal_path, 'w', encoding='utf-8')
+            self._journal.write(json.dumps({'version': JOURNAL_VERSION}) + '\n')
+        return self._journal
+
+    def flush(self):
+        """Journal, then write and rename every queued file, one directory at a time."""
+        if not self.pending:
+            return
+
+        journal = self._open_journal()
+        for files in self.pending.values():
+            for path, original, data in files:
+                journal.write(json.dumps({
+                    'path': self.relative_path(path),
+                    'original': base64.b64encode(zlib.compress(original)).decode('ascii'),
+                    'written': hashlib.sha256(data).hexdigest(),
+                }) + '\n')
+        journal.flush()
+        os.fsync(journal.fileno())
+
+        for directory, files in self.pending.items():
+            temp_paths = [_write_temp(path, data) for path, _, data in files]
+            for (path, _, _), temp_path in zip(files, temp_paths):
+                os.replace(temp_path, path)
+            _sync_directory(directory)
+            self.written += len(files)
+            if self.on_written is not None:
+                for path, _, _ in files:
+                    self.on_written(path)
+        self.pending = {}
+
+    def close(self):
+        """Write whatever is still queued and close the journal."""
+        try:
+            self.flush()
+        finally:
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+
+def read_journal(journal_path):
+    """Entries of a journal, in write order; [] if there is none."""
+    try:
+        with open(journal_path, 'r', encoding='utf-8') as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return []
+    if not lines or json.loads(lines[0]).get('version') != JOURNAL_VERSION:
+        return []
+    # A torn last line means the run died while journaling that batch, before
+    # any of its files were renamed
+    entries = []
+    for line in lines[1:]:
+        try:
+            entries.append(json.loads(line))
+        except ValueError:
+            break
+    return entries
+
+def rollback(root, journal_path=None):
+    """
+    Restore the files of the last journaled run.
+
+    A file is only restored while it still holds the bytes the run wrote;
+    files edited since then are left alone and returned as skipped.
+    Returns (restored paths, skipped paths).
+    """
+    root = Path(root)
+    journal_path = Path(journal_path or root / CACHE_DIR / 'journal.jsonl')
+    restored = []
+    skipped = []
+    directories = set()
+
+    # Newest first, so a file journaled twice ends at its oldest content
+    for entry in reversed(read_journal(journal_path)):
+        path = root / entry['path']
+        original = zlib.decompress(base64.b64decode(entry['original']))
+        try:
+            with open(path, 'rb') as f:
+                current = f.read()
+        except OSError:
+            skipped.append(path)
+            continue
+        if current == original:
+            # The run stopped before this file was renamed
+            continue
+        if hashlib.sha256(current).hexdigest() != entry['written']:
+            skipped.append(path)
+            continue
+        os.replace(_write_temp(path, original), path)
+        directories.add(path.parent)
+        restored.append(path)
+
+    for directory in directories:
+        _sync_directory(directory)
+    if journal_path.exists():
+        journal_path.unlink()
+    return restored, skipped
+
+def add_rollback_argument(parser):
+    """Register the --rollback option on an argparse parser."""
+    parser.add_argument(
+        '--rollback',
+        action='store_true',
+        help='restore the files changed by the last run from the journal, then exit',
+    )
+
+def run_rollback(root):
+    """--rollback: restore the last run and print what happened."""
+    restored, skipped = rollback(root)
+    for path in restored:
+        print(f"✓ restored {Path(path).relative_to(root)}")
+    for path in skipped:
+        print(f"✗ skipped {Path(path).relative_to(root)} (changed since the run)")
+    print(f"\nRestored {len(restored)} files, skipped {len(skipped)}")
+    return not skipped
+
+def main():
+    """Roll back the last run, or list what it changed."""
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument('--rollback', action='store_true',
+                       help='restore the files changed by the last run')
+    group.add_argument('--show', action='store_true',
+                       help='list the files the journal can restore')
+    args = parser.parse_args()
+
+    root = Path(__file__).resolve().parent.parent
+    if args.show:
+        entries = read_journal(root / CACHE_DIR / 'journal.jsonl')
+        for entry in entries:
+            print(entry['path'])
+        print(f"\n{len(entries)} files in the journal")
+        return
+
+    if not run_rollback(root):
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()